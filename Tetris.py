@@ -1,17 +1,19 @@
 import sys
-import os
+import time
+import argparse
 import pygame
-import random
-import json
-from datetime import datetime
 
-# Absoluter Pfad zur highscores.json im gleichen Verzeichnis wie dieses Skript.
-# Falls die Datei noch nicht existiert, wird sie später erstellt.
-HIGH_SCORE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                               "highscores.json")
+from tetris_engine import (
+    COLORS, PIECE_OFFSETS, PIECE_BOUNDS, TICK_MS, TetrisEngine, TetrisBot, AutoShift,
+    ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP, ACTION_HOLD,
+)
+from tetris_replay import (
+    InputRecorder, load_replay, decode_steps, replay_engine, check_result, timing_summary,
+)
+from highscores import highscore_store
 
-# Pygame initialisieren
-pygame.init()
+# Name der Tetris-Tabelle in der gemeinsamen Highscore-Datei
+HIGHSCORE_BOARD = "tetris"
 
 # Standardbildschirm-Dimensionen (werden später überschrieben)
 WIDTH, HEIGHT = 800, 600
@@ -34,133 +36,30 @@ YELLOW = (255, 255, 0)
 ORANGE = (255, 165, 0)
 LIGHT_GRAY = (100, 100, 100)
 
-# Farbkodierungen der Tetrominoes
-COLORS = [
-    (0, 240, 240),  # Hellblau (I)
-    (0, 0, 240),    # Blau (J)
-    (240, 160, 0),  # Orange (L)
-    (240, 240, 0),  # Gelb (O)
-    (0, 240, 0),    # Grün (S)
-    (160, 0, 240),  # Lila (T)
-    (240, 0, 0)     # Rot (Z)
-]
-
-# Definition der Tetromino-Formen (jede Form als Liste von Rotationen)
-SHAPES = [
-    [
-        ['.....',
-         '.....',
-         '.....',
-         'OOOO.',
-         '.....'],
-        ['.....',
-         '..O..',
-         '..O..',
-         '..O..',
-         '..O..']
-    ],
-    [
-        ['.....',
-         '.....',
-         '..O..',
-         '.OOO.',
-         '.....'],
-        ['.....',
-         '..O..',
-         '.OO..',
-         '..O..',
-         '.....'],
-        ['.....',
-         '.....',
-         '.OOO.',
-         '..O..',
-         '.....'],
-        ['.....',
-         '..O..',
-         '..OO.',
-         '..O..',
-         '.....']
-    ],
-    [
-        ['.....',
-         '.....',
-         '..OO.',
-         '.OO..',
-         '.....'],
-        ['.....',
-         '.O...',
-         '.OO..',
-         '..O..',
-         '.....']
-    ],
-    [
-        ['.....',
-         '.....',
-         '.OO..',
-         '..OO.',
-         '.....'],
-        ['.....',
-         '..O..',
-         '.OO..',
-         '.O...',
-         '.....']
-    ],
-    [
-        ['.....',
-         '.....',
-         '.OOO.',
-         '.O...',
-         '.....'],
-        ['.....',
-         '.OO..',
-         '..O..',
-         '..O..',
-         '.....'],
-        ['.....',
-         '.....',
-         '...O.',
-         '.OOO.',
-         '.....'],
-        ['.....',
-         '.O...',
-         '.O...',
-         '.OO..',
-         '.....']
-    ],
-    [
-        ['.....',
-         '.....',
-         '.OOO.',
-         '...O.',
-         '.....'],
-        ['.....',
-         '..O..',
-         '..O..',
-         '.OO..',
-         '.....'],
-        ['.....',
-         '.....',
-         '.O...',
-         '.OOO.',
-         '.....'],
-        ['.....',
-         '.OO..',
-         '.O...',
-         '.O...',
-         '.....']
-    ],
-    [
-        ['.....',
-         '.....',
-         '.OO..',
-         '.OO..',
-         '.....']
-    ]
-]
+# Hervorgehobene Randfarben der Tetrominoes je Form-ID
+HIGHLIGHT_COLORS = [tuple(min(c + 30, 255) for c in color) for color in COLORS]
+
+# Höchstens so viele Bilder pro Sekunde werden gezeichnet; die Spiellogik
+# läuft unabhängig davon mit TICK_RATE (siehe tetris_engine.py)
+RENDER_FPS = 60
+# Mehr Logik-Ticks werden pro Durchlauf nicht nachgeholt
+MAX_TICKS_PER_FRAME = 60
+
+# Abstand zwischen zwei Aktionen des Autoplayers im Demo-Modus (ms)
+BOT_ACTION_MS = 60
+# Wartezeit nach Game Over, bevor der Demo-Modus eine neue Partie beginnt (ms)
+DEMO_RESTART_MS = 3000
 
 # Flag zur Speicherung des aktuellen Vollbildmodus-Status
 fullscreen_mode = False
 
+# Schriftarten nach Größe, werden je Auflösung in update_display_variables erzeugt
+FONT_SIZES = (24, 28, 30, 36, 72)
+FONTS = {}
+
+# Gezeichnete Tetrominoes für Vorschau und Hold nach (Form-ID, Zellgröße)
+_sprite_cache = {}
+
 def update_display_variables(screen_width, screen_height):
     """
     Aktualisiert die globalen Variablen für Bildschirm und Spielfeld,
@@ -175,6 +74,10 @@ def update_display_variables(screen_width, screen_height):
     # Zentriere das Spielfeld
     PLAY_X = (WIDTH - PLAY_WIDTH) // 2
     PLAY_Y = (HEIGHT - PLAY_HEIGHT) // 2
+    # Schriftarten einmal je Auflösung statt in jedem Frame erzeugen
+    FONTS.clear()
+    for size in FONT_SIZES:
+        FONTS[size] = pygame.font.Font(None, size)
     print(f"Display aktualisiert: {WIDTH}x{HEIGHT}, Spielfeld bei ({PLAY_X},{PLAY_Y})")
 
 # --- Klassen und Funktionen für GUI-Elemente und Highscore Verwaltung ---
@@ -210,70 +113,6 @@ class Button:
             return self.hovered
         return False
 
-def load_highscores():
-    """
-    Lädt Highscores aus der Datei HIGH_SCORE_FILE.
-    Falls die Datei noch nicht existiert, wird sie mit einem leeren Array erzeugt.
-    """
-    try:
-        if not os.path.exists(HIGH_SCORE_FILE):
-            with open(HIGH_SCORE_FILE, "w") as file:
-                json.dump([], file)
-            return []
-        with open(HIGH_SCORE_FILE, "r") as file:
-            highscores = json.load(file)
-            highscores.sort(key=lambda x: x["score"], reverse=True)
-            return highscores
-    except Exception as e:
-        print(f"Fehler beim Laden der Highscores: {e}")
-        return []
-
-def save_highscore(name, score):
-    """
-    Speichert einen neuen Highscore. Falls der Name bereits existiert,
-    wird nur überschrieben, wenn der neue Score höher ist.
-    """
-    try:
-        highscores = load_highscores()
-        date = datetime.now().strftime("%d.%m.%Y %H:%M")
-        new_score = {"name": name, "score": score, "date": date}
-
-        existing_entry = None
-        for i, entry in enumerate(highscores):
-            if entry["name"] == name:
-                existing_entry = (i, entry)
-                break
-
-        if existing_entry:
-            i, entry = existing_entry
-            if score > entry["score"]:
-                highscores[i] = new_score
-                print(f"Highscore für {name} aktualisiert: {entry['score']} -> {score}")
-            else:
-                print(f"Score {score} nicht gespeichert (niedriger als vorhandener Score {entry['score']})")
-                return True
-        else:
-            highscores.append(new_score)
-            print(f"Neuer Highscore für {name}: {score} gespeichert!")
-
-        highscores.sort(key=lambda x: x["score"], reverse=True)
-        highscores = highscores[:10]
-        with open(HIGH_SCORE_FILE, "w") as file:
-            json.dump(highscores, file)
-        return True
-    except Exception as e:
-        print(f"Fehler beim Speichern des Highscores: {e}")
-        return False
-
-def get_top_score():
-    """
-    Gibt den höchsten Highscore zurück oder einen Standardwert, falls keine Highscores vorhanden sind.
-    """
-    highscores = load_highscores()
-    if highscores:
-        return highscores[0]
-    return {"name": "-----", "score": 0, "date": ""}
-
 # --- Klassen für Texteingabe und Spielobjekte ---
 
 class TextInput:
@@ -324,219 +163,65 @@ class TextInput:
                              (cursor_pos, self.rect.y + self.rect.height - 5),
                              2)
 
-class Tetromino:
+class Tetris(TetrisEngine):
     """
-    Repräsentiert ein Tetromino.
+    Die Hauptklasse des Spiels für die pygame-Oberfläche. Die Spielregeln stammen
+    aus TetrisEngine, hier kommen Spielername, Pause und Highscores hinzu.
     """
-    def __init__(self, x, y, shape):
-        self.x = x
-        self.y = y
-        self.shape = shape
-        self.color = COLORS[SHAPES.index(shape)]
-        self.rotation = 0
-
-    def get_positions(self):
-        """
-        Gibt eine Liste der (x,y)-Positionen zurück, an denen das Tetromino aktuell gezeichnet wird.
-        """
-        positions = []
-        form = self.shape[self.rotation % len(self.shape)]
-        for i, line in enumerate(form):
-            for j, column in enumerate(list(line)):
-                if column == "O":
-                    positions.append((self.x + j, self.y + i))
-        return positions
-
-class Tetris:
-    """
-    Die Hauptklasse des Spiels. Hier wird das Spielfeld verwaltet, neue Tetrominoes erzeugt
-    und Spielzustände verwaltet (z. B. Score, Level, Game Over).
-    """
-    def __init__(self, width, height, player_name):
-        self.width = width
-        self.height = height
-        self.grid = [[BLACK for _ in range(width)] for _ in range(height)]
-        self.current_piece = self.new_piece()
-        self.next_piece = self.new_piece()
-        self.score = 0
-        self.level = 0
-        self.lines_cleared = 0
-        self.game_over = False
+    def __init__(self, width, height, player_name, seed=None):
+        super().__init__(width, height, seed, verbose=True)
         self.paused = False
-        self.current_fall_speed = 250  # Start-Fallgeschwindigkeit (ms)
         self.player_name = player_name
-        self.held_piece = None
-        self.can_hold = True  # Ermöglicht das einmalige Halten eines Stücks pro Drop
-
-        self.highscores = load_highscores()
-        self.top_score = get_top_score()
+        # Wird gesetzt, sobald der Demo-Modus mitspielt: dann kein Highscore
+        self.autoplayed = False
+        # Alle Schritte werden aufgezeichnet, damit sich die Partie nachspielen lässt
+        self.recorder = InputRecorder(self, player_name)
+        self.replay_path = None
+
+        self.highscores = highscore_store.get(HIGHSCORE_BOARD)
+        self.top_score = highscore_store.top(HIGHSCORE_BOARD)
         print(f"Aktueller Top-Score: {self.top_score['score']} von {self.top_score['name']}")
 
-        # Lock-Delay beim Setzen eines Stücks
-        self.lock_delay = 400  # 400ms
-        self.lock_timer = 0
-        self.piece_landed = False
-
-    def try_rotation(self):
-        """
-        Versucht, das aktuelle Tetromino zu rotieren.
-        Falls eine Kollision (z. B. an der Wand) besteht, werden sogenannte Wall-Kicks ausprobiert.
+    def step(self, actions=(), dt_ms=0):
         """
-        if self.valid_move(self.current_piece, rotation=1):
-            self.current_piece.rotation += 1
-            if self.piece_landed:
-                self.lock_timer = 0
-        else:
-            if self.valid_move(self.current_piece, x_offset=-1, rotation=1):
-                self.current_piece.x -= 1
-                self.current_piece.rotation += 1
-                if self.piece_landed:
-                    self.lock_timer = 0
-            elif self.valid_move(self.current_piece, x_offset=1, rotation=1):
-                self.current_piece.x += 1
-                self.current_piece.rotation += 1
-                if self.piece_landed:
-                    self.lock_timer = 0
-            elif (self.current_piece.shape == SHAPES[0] and 
-                  self.valid_move(self.current_piece, x_offset=-2, rotation=1)):
-                self.current_piece.x -= 2
-                self.current_piece.rotation += 1
-                if self.piece_landed:
-                    self.lock_timer = 0
-            elif (self.current_piece.shape == SHAPES[0] and 
-                  self.valid_move(self.current_piece, x_offset=2, rotation=1)):
-                self.current_piece.x += 2
-                self.current_piece.rotation += 1
-                if self.piece_landed:
-                    self.lock_timer = 0
-
-    def hold_piece(self):
-        """
-        Ermöglicht es dem Spieler, das aktuelle Tetromino zu "halten" (auszuwechseln).
-        Wird nur einmal pro Stückzug ausgeführt.
-        """
-        if not self.can_hold:
-            return
-        if self.held_piece:
-            self.current_piece, self.held_piece = self.held_piece, self.current_piece
-            self.current_piece.x = self.width // 2 - 2
-            self.current_piece.y = 0
-            self.current_piece.rotation = 0
-        else:
-            self.held_piece = self.current_piece
-            self.current_piece = self.next_piece
-            self.next_piece = self.new_piece()
-        self.can_hold = False
-        self.piece_landed = False
-        self.lock_timer = 0
-
-    def new_piece(self):
-        """
-        Erzeugt ein neues Tetromino, das an der Startposition erscheint.
-        """
-        shape = random.choice(SHAPES)
-        return Tetromino(self.width // 2 - 2, 0, shape)
-    
-    def valid_move(self, piece, x_offset=0, y_offset=0, rotation=0):
-        """
-        Überprüft, ob eine Bewegung (Verschiebung und/oder Rotation) gültig ist,
-        also nicht in einen bereits besetzten Bereich oder außerhalb des Spielfelds führt.
-        """
-        temp_rotation = (piece.rotation + rotation) % len(piece.shape)
-        form = piece.shape[temp_rotation]
-        for i, line in enumerate(form):
-            for j, column in enumerate(list(line)):
-                if column == "O":
-                    x = piece.x + j + x_offset
-                    y = piece.y + i + y_offset
-                    if x < 0 or x >= self.width or y >= self.height:
-                        return False
-                    if y >= 0 and self.grid[y][x] != BLACK:
-                        return False
-        return True
-    
-    def clear_lines(self):
-        """
-        Löscht volle Zeilen im Gitter, aktualisiert den Punktestand und passt das Level an.
-        """
-        lines_to_clear = []
-        for i in range(self.height):
-            if BLACK not in self.grid[i]:
-                lines_to_clear.append(i)
-        if len(lines_to_clear) == 1:
-            self.score += 40 * (self.level + 1)
-        elif len(lines_to_clear) == 2:
-            self.score += 100 * (self.level + 1)
-        elif len(lines_to_clear) == 3:
-            self.score += 300 * (self.level + 1)
-        elif len(lines_to_clear) == 4:
-            self.score += 1200 * (self.level + 1)
-        for line in sorted(lines_to_clear, reverse=True):
-            del self.grid[line]
-            self.grid.insert(0, [BLACK for _ in range(self.width)])
-        self.lines_cleared += len(lines_to_clear)
-        old_level = self.level
-        self.level = self.lines_cleared // 10
-        if self.level > old_level:
-            self.current_fall_speed = max(50, 250 - (self.level * 30))
-            print(f"Level up! Neues Level: {self.level}, Geschwindigkeit: {self.current_fall_speed}")
-    
-    def get_shadow_piece(self):
-        """
-        Berechnet eine "Schatten"-Version des aktuellen Tetrominos, die anzeigt,
-        wo das Stück landen wird.
+        Wie TetrisEngine.step, der Schritt wird zusätzlich aufgezeichnet.
+        Nach dem Game Over ändert step nichts mehr und wird nicht aufgezeichnet.
         """
         if self.game_over:
-            return None
-        shadow_piece = Tetromino(self.current_piece.x, self.current_piece.y, self.current_piece.shape)
-        shadow_piece.rotation = self.current_piece.rotation
-        while self.valid_move(shadow_piece, y_offset=1):
-            shadow_piece.y += 1
-        return shadow_piece
-    
+            return 0
+        self.recorder.record(actions, dt_ms)
+        return super().step(actions, dt_ms)
+
+    def save_replay(self):
+        """Speichert die Aufzeichnung der Partie (nur einmal und nur, wenn gespielt wurde)."""
+        if self.replay_path is None and self.recorder.steps:
+            self.replay_path = self.recorder.save(self)
+
     def lock_piece(self):
         """
-        Setzt das aktuelle Tetromino endgültig in das Gitter ein (blockiert seine Position),
-        löscht nötige Zeilen und prüft, ob das Spiel vorbei ist (Game Over).
+        Setzt das Stück wie TetrisEngine.lock_piece und trägt bei Game Over
+        den Highscore ein. Die Datei wird im Hintergrund geschrieben.
         """
-        top_blocked = False
-        for pos in self.current_piece.get_positions():
-            x, y = pos
-            if y < 0:
-                top_blocked = True
-                break
-        for pos in self.current_piece.get_positions():
-            x, y = pos
-            if y >= 0:
-                self.grid[y][x] = self.current_piece.color
-        self.clear_lines()
-        self.current_piece = self.next_piece
-        self.next_piece = self.new_piece()
-        self.can_hold = True
-        self.piece_landed = False
-        self.lock_timer = 0
-        if top_blocked or not self.valid_move(self.current_piece):
-            self.game_over = True
-            is_top_10 = False
-            if not self.highscores or self.score > self.highscores[-1]["score"] \
-               or len(self.highscores) < 10:
-                is_top_10 = True
-            if is_top_10:
-                print(f"Neuer Highscore für {self.player_name}: {self.score}")
-                save_success = save_highscore(self.player_name, self.score)
-                if not save_success:
-                    print("Fehler: Highscore konnte nicht gespeichert werden!")
-                self.highscores = load_highscores()
+        super().lock_piece()
+        if self.game_over:
+            self.save_replay()
+        if self.game_over and self.autoplayed:
+            print("Demo-Spiel: Highscore wird nicht gespeichert")
+        elif self.game_over:
+            if highscore_store.submit(HIGHSCORE_BOARD, self.player_name, self.score):
+                self.highscores = highscore_store.get(HIGHSCORE_BOARD)
 
 # --- Zeichenfunktionen für die Spielfeld-Grafik ---
 
-def draw_grid(screen, grid):
+def draw_grid(screen, grid, origin=None):
     """
     Zeichnet das Spielfeldgitter sowie die darin enthaltenen Blöcke.
+    origin ist die linke obere Ecke, standardmäßig die des Spielfelds.
     """
+    origin_x, origin_y = origin if origin else (PLAY_X, PLAY_Y)
     for i in range(len(grid)):
         for j in range(len(grid[i])):
-            rect = (PLAY_X + j * GRID_SIZE, PLAY_Y + i * GRID_SIZE,
+            rect = (origin_x + j * GRID_SIZE, origin_y + i * GRID_SIZE,
                     GRID_SIZE, GRID_SIZE)
             pygame.draw.rect(screen, grid[i][j], rect, 0)
             pygame.draw.rect(screen, GRAY, rect, 1)
@@ -548,44 +233,71 @@ def draw_piece(screen, piece, is_shadow=False):
     """
     if piece is None:
         return
-    for pos in piece.get_positions():
-        x, y = pos
+    for dx, dy in piece.get_offsets():
+        x = piece.x + dx
+        y = piece.y + dy
         if y >= 0:
-            color = LIGHT_GRAY if is_shadow else piece.color
-            border_color = GRAY if is_shadow else WHITE
             rect = (PLAY_X + x * GRID_SIZE, PLAY_Y + y * GRID_SIZE,
                     GRID_SIZE, GRID_SIZE)
             if is_shadow:
-                pygame.draw.rect(screen, color, rect, 1)
+                pygame.draw.rect(screen, LIGHT_GRAY, rect, 1)
             else:
-                pygame.draw.rect(screen, color, rect, 0)
+                pygame.draw.rect(screen, piece.color, rect, 0)
                 highlight_rect = (rect[0] + 1, rect[1] + 1,
                                   rect[2] - 2, rect[3] - 2)
-                pygame.draw.rect(screen, tuple(min(c + 30, 255) for c in color),
+                pygame.draw.rect(screen, HIGHLIGHT_COLORS[piece.shape_id],
                                  highlight_rect, 1)
-                pygame.draw.rect(screen, border_color, rect, 1)
+                pygame.draw.rect(screen, WHITE, rect, 1)
+
+def get_piece_sprite(shape_id, cell_size):
+    """
+    Gibt ein Tetromino (Rotation 0) als Fläche in der Größe seines Rahmens zurück.
+    Die Flächen werden je Form und Zellgröße einmal gezeichnet und wiederverwendet.
+    """
+    key = (shape_id, cell_size)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        min_dx, min_dy, max_dx, max_dy = PIECE_BOUNDS[shape_id][0]
+        sprite = pygame.Surface(((max_dx - min_dx + 1) * cell_size,
+                                 (max_dy - min_dy + 1) * cell_size), pygame.SRCALPHA)
+        for dx, dy in PIECE_OFFSETS[shape_id][0]:
+            rect = ((dx - min_dx) * cell_size, (dy - min_dy) * cell_size,
+                    cell_size, cell_size)
+            pygame.draw.rect(sprite, COLORS[shape_id], rect, 0)
+            highlight_rect = (rect[0] + 1, rect[1] + 1,
+                              rect[2] - 2, rect[3] - 2)
+            pygame.draw.rect(sprite, HIGHLIGHT_COLORS[shape_id], highlight_rect, 1)
+            pygame.draw.rect(sprite, WHITE, rect, 1)
+        _sprite_cache[key] = sprite
+    return sprite
+
+def blit_piece_sprite(screen, shape_id, x, y, cell_size):
+    """
+    Zeichnet ein Tetromino so, als läge seine 5x5-Vorlage bei (x, y).
+    """
+    min_dx, min_dy = PIECE_BOUNDS[shape_id][0][:2]
+    screen.blit(get_piece_sprite(shape_id, cell_size),
+                (x + min_dx * cell_size, y + min_dy * cell_size))
 
-def draw_next_piece(screen, piece):
+def draw_next_piece(screen, shape_ids):
     """
-    Zeichnet das nächste Tetromino an einer vorgegebenen Position auf dem Bildschirm.
+    Zeichnet die Vorschau: das nächste Tetromino in voller Größe, die
+    folgenden verkleinert darunter.
     """
-    font = pygame.font.Font(None, 30)
+    font = FONTS[30]
     label = font.render("Next:", True, WHITE)
     screen.blit(label, (WIDTH - 150, 100))
     next_x = WIDTH - 150
     next_y = 150
-    form = piece.shape[0]
-    for i, line in enumerate(form):
-        for j, column in enumerate(list(line)):
-            if column == "O":
-                rect = (next_x + j * GRID_SIZE, next_y + i * GRID_SIZE,
-                        GRID_SIZE, GRID_SIZE)
-                pygame.draw.rect(screen, piece.color, rect, 0)
-                highlight_rect = (rect[0] + 1, rect[1] + 1,
-                                  rect[2] - 2, rect[3] - 2)
-                pygame.draw.rect(screen, tuple(min(c + 30, 255) for c in piece.color),
-                                 highlight_rect, 1)
-                pygame.draw.rect(screen, WHITE, rect, 1)
+    if not shape_ids:
+        return
+    blit_piece_sprite(screen, shape_ids[0], next_x, next_y, GRID_SIZE)
+    small_size = max(4, GRID_SIZE * 3 // 5)
+    y = next_y + 5 * GRID_SIZE
+    for shape_id in shape_ids[1:]:
+        # Die Formen belegen in Rotation 0 höchstens zwei Zeilen
+        screen.blit(get_piece_sprite(shape_id, small_size), (next_x + GRID_SIZE, y))
+        y += 3 * small_size
 
 def draw_held_piece(screen, piece):
     """
@@ -593,30 +305,19 @@ def draw_held_piece(screen, piece):
     """
     if piece is None:
         return
-    font = pygame.font.Font(None, 30)
+    font = FONTS[30]
     label = font.render("Hold:", True, WHITE)
     screen.blit(label, (30, 200))
     hold_x = 30
     hold_y = 240
-    form = piece.shape[0]
-    for i, line in enumerate(form):
-        for j, column in enumerate(list(line)):
-            if column == "O":
-                rect = (hold_x + j * GRID_SIZE, hold_y + i * GRID_SIZE,
-                        GRID_SIZE, GRID_SIZE)
-                pygame.draw.rect(screen, piece.color, rect, 0)
-                highlight_rect = (rect[0] + 1, rect[1] + 1,
-                                  rect[2] - 2, rect[3] - 2)
-                pygame.draw.rect(screen, tuple(min(c + 30, 255) for c in piece.color),
-                                 highlight_rect, 1)
-                pygame.draw.rect(screen, WHITE, rect, 1)
+    blit_piece_sprite(screen, piece.shape_id, hold_x, hold_y, GRID_SIZE)
 
 def draw_score(screen, score, level, lines, player_name):
     """
     Zeichnet den Spielername, den aktuellen Score, Level und die Anzahl
     gelöschter Zeilen.
     """
-    font = pygame.font.Font(None, 30)
+    font = FONTS[30]
     player_text = font.render(f"Player: {player_name}", True, WHITE)
     score_text = font.render(f"Score: {score}", True, WHITE)
     level_text = font.render(f"Level: {level}", True, WHITE)
@@ -625,15 +326,15 @@ def draw_score(screen, score, level, lines, player_name):
     screen.blit(score_text, (30, 100))
     screen.blit(level_text, (30, 130))
     screen.blit(lines_text, (30, 160))
-    help_text = font.render("F: Full Screen  P: Pause  ESC: Titel", True, GRAY)
+    help_text = font.render("F: Full Screen  P: Pause  D: Demo  ESC: Titel", True, GRAY)
     screen.blit(help_text, (WIDTH // 2 - help_text.get_width() // 2, 30))
 
 def draw_highscores(screen, highscores, x, y, title="Highscores", show_date=True):
     """
     Zeichnet eine Highscore-Tabelle mit Überschrift, Rang, Namen und Score.
     """
-    title_font = pygame.font.Font(None, 36)
-    text_font = pygame.font.Font(None, 24)
+    title_font = FONTS[36]
+    text_font = FONTS[24]
     title_text = title_font.render(title, True, YELLOW)
     screen.blit(title_text, (x, y))
     y += 40
@@ -671,9 +372,9 @@ def draw_game_over(screen, score, player_name, highscores):
     s = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     s.fill((0, 0, 0, 200))
     screen.blit(s, (0, 0))
-    font_big = pygame.font.Font(None, 72)
-    font_small = pygame.font.Font(None, 36)
-    font_button = pygame.font.Font(None, 28)
+    font_big = FONTS[72]
+    font_small = FONTS[36]
+    font_button = FONTS[28]
     game_over_text = font_big.render("GAME OVER", True, RED)
     player_text = font_small.render(f"Player: {player_name}", True, WHITE)
     score_text = font_small.render(f"Score: {score}", True, WHITE)
@@ -738,8 +439,8 @@ def draw_pause_screen(screen):
     s = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     s.fill((0, 0, 0, 180))
     screen.blit(s, (0, 0))
-    font_big = pygame.font.Font(None, 72)
-    font_small = pygame.font.Font(None, 36)
+    font_big = FONTS[72]
+    font_small = FONTS[36]
     pause_text = font_big.render("PAUSED", True, CYAN)
     continue_text = font_small.render("Press P to Continue", True, WHITE)
     shadow_offset = 3
@@ -752,6 +453,54 @@ def draw_pause_screen(screen):
     screen.blit(continue_text,
                 (WIDTH // 2 - continue_text.get_width() // 2, HEIGHT // 2 + 30))
 
+class GameRenderer:
+    """
+    Zeichnet den Spielbildschirm aus zwischengespeicherten Ebenen. Das Gitter
+    mit den abgelegten Blöcken und der Hintergrund mit Rahmen, Seitenleisten
+    und Texten werden nur neu gezeichnet, wenn sich Gitter, Punktestand oder
+    Stücke ändern. In jedem Frame werden nur der Hintergrund sowie Schatten
+    und aktives Stück geblittet.
+    """
+    def __init__(self):
+        self.size = None
+        self.board_layer = None
+        self.board_key = None
+        self.background = None
+        self.background_key = None
+
+    def draw(self, screen, game):
+        size = (WIDTH, HEIGHT, GRID_SIZE)
+        if size != self.size:
+            # Neue Auflösung: Ebenen in passender Größe anlegen
+            self.size = size
+            self.board_layer = pygame.Surface((PLAY_WIDTH, PLAY_HEIGHT)).convert()
+            self.background = pygame.Surface((WIDTH, HEIGHT)).convert()
+            self.board_key = None
+            self.background_key = None
+        board_key = (game, game.grid_version)
+        if board_key != self.board_key:
+            self.board_key = board_key
+            draw_grid(self.board_layer, game.grid, (0, 0))
+        held_id = game.held_piece.shape_id if game.held_piece else None
+        background_key = (board_key, game.preview(), held_id, game.score,
+                          game.level, game.lines_cleared, game.player_name)
+        if background_key != self.background_key:
+            self.background_key = background_key
+            self.background.fill(BLACK)
+            # Rahmen um das Spielfeld
+            pygame.draw.rect(self.background, WHITE,
+                             (PLAY_X - 2, PLAY_Y - 2, PLAY_WIDTH + 4, PLAY_HEIGHT + 4),
+                             2)
+            self.background.blit(self.board_layer, (PLAY_X, PLAY_Y))
+            draw_next_piece(self.background, game.preview())
+            draw_held_piece(self.background, game.held_piece)
+            draw_score(self.background, game.score, game.level, game.lines_cleared,
+                       game.player_name)
+        screen.blit(self.background, (0, 0))
+        if not game.game_over:
+            draw_piece(screen, game.get_shadow_piece(), is_shadow=True)
+            draw_piece(screen, game.current_piece)
+
 def toggle_fullscreen(screen):
     """
     Schaltet zwischen Vollbild- und Fenstermodus um.
@@ -784,19 +533,19 @@ def name_input_screen(screen):
     """
     Zeigt einen Bildschirm zur Namenseingabe an und gibt den eingegebenen Namen zurück.
     """
-    font_big = pygame.font.Font(None, 72)
-    font_medium = pygame.font.Font(None, 36)
-    font_small = pygame.font.Font(None, 24)
+    font_big = FONTS[72]
+    font_medium = FONTS[36]
+    font_small = FONTS[24]
     title_text = font_big.render("TETRIS", True, CYAN)
     input_text = font_medium.render("Enter Your Name:", True, WHITE)
     hint_text = font_small.render("(Press ENTER when done)", True, GRAY)
     name_input = TextInput(WIDTH // 2 - 150, HEIGHT // 2, 300, font_medium)
-    highscores = load_highscores()
+    highscores = highscore_store.get(HIGHSCORE_BOARD)
     running = True
+    shadow_offset = 3
+    title_shadow = font_big.render("TETRIS", True, BLUE)
     while running:
         screen.fill(BLACK)
-        shadow_offset = 3
-        title_shadow = font_big.render("TETRIS", True, BLUE)
         screen.blit(title_shadow,
                     (WIDTH // 2 - title_text.get_width() // 2 + shadow_offset,
                      100 + shadow_offset))
@@ -811,10 +560,12 @@ def name_input_screen(screen):
         pygame.display.update()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                highscore_store.flush()
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
+                    highscore_store.flush()
                     pygame.quit()
                     sys.exit()
                 elif event.key == pygame.K_f:
@@ -825,14 +576,18 @@ def name_input_screen(screen):
                     player_name = "Player"
                 return player_name
 
-def main(use_existing_player=False, existing_player_name=None):
+def main(use_existing_player=False, existing_player_name=None, demo=False):
     """
-    Hauptfunktion des Spiels.
+    Hauptfunktion des Spiels. Mit demo=True spielt von Anfang an der
+    Autoplayer (Attract-Modus), mit D lässt er sich jederzeit umschalten.
     
     WICHTIG: Hier wird der Bildschirm immer im Vollbildmodus gestartet. Dazu werden
     zunächst die aktuellen Bildschirminformationen abgefragt und dann ein
     Vollbildfenster eröffnet. Anschließend werden die Displayvariablen aktualisiert.
     """
+    # Pygame initialisieren
+    pygame.init()
+
     # Start im Vollbildmodus
     info = pygame.display.Info()
     screen = pygame.display.set_mode(
@@ -845,34 +600,43 @@ def main(use_existing_player=False, existing_player_name=None):
     # Namenseingabe – entweder über ein existierendes Profil oder neue Eingabe
     if use_existing_player and existing_player_name:
         player_name = existing_player_name
+    elif demo:
+        player_name = "Demo"
     else:
         player_name = name_input_screen(screen)
 
-    clock = pygame.time.Clock()
-
     # Erstelle eine neue Tetris-Instanz (Spielfeld 10x20)
     game = Tetris(10, 20, player_name)
-    fall_time = 0
-    last_time = pygame.time.get_ticks()
+    game.autoplayed = demo
 
-    # Variablen für Button-Handling, Tastaturwiederholungen etc.
+    # Variablen für Button-Handling etc.
     restart_button = None
     new_profile_button = None
     exit_button = None
-    key_repeat_time = 0
-    key_repeat_delay = 150  # Zeit in ms bis Wiederholung bei gehaltenen Tasten
-    key_repeat_interval = 1000 // 7  # Wiederholungsintervall
-    move_left = False
-    move_right = False
-    move_down = False
+
+    renderer = GameRenderer()
+
+    # Feste Logikrate: Die vergangene Zeit wird gesammelt und in Ticks von
+    # TICK_MS an game.step übergeben; gezeichnet wird höchstens mit RENDER_FPS.
+    # Zwischen den Frames werden Eingaben vor jedem Tick abgefragt.
+    auto_shift = AutoShift(width=game.width)
+    pending_actions = []  # Sofortaktionen aus Tastendrücken für den nächsten Tick
+    accumulator = 0.0
+    last_time = time.perf_counter()
+    next_render = last_time
+    active_game = game
+
+    # Demo-Modus: Der Autoplayer plant je Stück und führt die geplanten
+    # Aktionen im Abstand von BOT_ACTION_MS aus
+    bot = TetrisBot()
+    bot_actions = []
+    bot_piece = None
+    bot_timer = 0
+    demo_restart_timer = 0
+    demo_label = FONTS[36].render("DEMO", True, YELLOW)
 
     running = True
     while running:
-        screen.fill(BLACK)
-        # Zeichne einen Rahmen um das Spielfeld
-        pygame.draw.rect(screen, WHITE,
-                         (PLAY_X - 2, PLAY_Y - 2, PLAY_WIDTH + 4, PLAY_HEIGHT + 4),
-                         2)
         mouse_pos = pygame.mouse.get_pos()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -886,127 +650,203 @@ def main(use_existing_player=False, existing_player_name=None):
                         game.paused = not game.paused
                 if not game.game_over and not game.paused:
                     if event.key == pygame.K_LEFT:
-                        if game.valid_move(game.current_piece, x_offset=-1):
-                            game.current_piece.x -= 1
-                            if game.piece_landed:
-                                game.lock_timer = 0
-                        move_left = True
-                        key_repeat_time = 0
+                        pending_actions.extend(auto_shift.press(ACTION_LEFT))
                     elif event.key == pygame.K_RIGHT:
-                        if game.valid_move(game.current_piece, x_offset=1):
-                            game.current_piece.x += 1
-                            if game.piece_landed:
-                                game.lock_timer = 0
-                        move_right = True
-                        key_repeat_time = 0
+                        pending_actions.extend(auto_shift.press(ACTION_RIGHT))
                     elif event.key == pygame.K_DOWN:
-                        if game.valid_move(game.current_piece, y_offset=1):
-                            game.current_piece.y += 1
-                        move_down = True
-                        key_repeat_time = 0
+                        pending_actions.extend(auto_shift.press(ACTION_DOWN))
                     elif event.key == pygame.K_UP:
-                        game.try_rotation()
+                        pending_actions.append(ACTION_ROTATE)
                     elif event.key == pygame.K_SPACE:
-                        # "Hard drop" – das Stück wird so weit nach unten bewegt, bis es nicht mehr gültig ist.
-                        while game.valid_move(game.current_piece, y_offset=1):
-                            game.current_piece.y += 1
-                        game.lock_piece()
+                        # "Hard drop" – das Stück fällt direkt um die zwischengespeicherte Fallhöhe.
+                        pending_actions.append(ACTION_HARD_DROP)
                     elif event.key == pygame.K_c or event.key == pygame.K_LSHIFT:
-                        game.hold_piece()
+                        pending_actions.append(ACTION_HOLD)
                     elif event.key == pygame.K_p:
                         game.paused = True
+                    elif event.key == pygame.K_d:
+                        demo = not demo
+                        game.autoplayed = game.autoplayed or demo
+                        bot_piece = None
                 elif event.key == pygame.K_p and game.paused:
                     game.paused = False
                 elif game.game_over:
                     if event.key == pygame.K_r:
                         # Weiterspielen mit gleichem Profil
                         game = Tetris(10, 20, player_name)
-                        fall_time = 0
-                        last_time = pygame.time.get_ticks()
+                        game.autoplayed = demo
                     elif event.key == pygame.K_n:
                         # Neues Profil – öffnet den Namenseingabebildschirm erneut
                         player_name = name_input_screen(screen)
                         game = Tetris(10, 20, player_name)
-                        fall_time = 0
-                        last_time = pygame.time.get_ticks()
+                        game.autoplayed = demo
                 if event.key == pygame.K_f:
                     screen = toggle_fullscreen(screen)
             elif event.type == pygame.KEYUP:
                 if event.key == pygame.K_LEFT:
-                    move_left = False
+                    auto_shift.release(ACTION_LEFT)
                 elif event.key == pygame.K_RIGHT:
-                    move_right = False
+                    auto_shift.release(ACTION_RIGHT)
                 elif event.key == pygame.K_DOWN:
-                    move_down = False
+                    auto_shift.release(ACTION_DOWN)
             if game.game_over:
                 if restart_button and restart_button.is_clicked(event):
                     game = Tetris(10, 20, player_name)
-                    fall_time = 0
-                    last_time = pygame.time.get_ticks()
+                    game.autoplayed = demo
                 elif new_profile_button and new_profile_button.is_clicked(event):
                     player_name = name_input_screen(screen)
                     game = Tetris(10, 20, player_name)
-                    fall_time = 0
-                    last_time = pygame.time.get_ticks()
+                    game.autoplayed = demo
                 elif exit_button and exit_button.is_clicked(event):
                     running = False
-        if game.paused:
-            draw_pause_screen(screen)
-            pygame.display.update()
-            clock.tick(60)
-            continue
-        current_time = pygame.time.get_ticks()
-        dt = current_time - last_time
+        current_time = time.perf_counter()
+        if game is not active_game or game.paused:
+            # Neue Partie, Pause oder Namenseingabe: keine Zeit nachholen
+            active_game = game
+            pending_actions = []
+            auto_shift.reset()
+            accumulator = 0.0
+            bot_piece = None
+        else:
+            accumulator += (current_time - last_time) * 1000
         last_time = current_time
-        if not game.game_over and not game.paused:
-            if move_left or move_right or move_down:
-                key_repeat_time += dt
-                if key_repeat_time >= key_repeat_delay:
-                    if move_left and game.valid_move(game.current_piece, x_offset=-1):
-                        game.current_piece.x -= 1
-                        if game.piece_landed:
-                            game.lock_timer = 0
-                    if move_right and game.valid_move(game.current_piece, x_offset=1):
-                        game.current_piece.x += 1
-                        if game.piece_landed:
-                            game.lock_timer = 0
-                    if move_down and game.valid_move(game.current_piece, y_offset=1):
-                        game.current_piece.y += 1
-                    key_repeat_time = key_repeat_delay - key_repeat_interval
-            if not game.valid_move(game.current_piece, y_offset=1):
-                game.piece_landed = True
-                game.lock_timer += dt
-                if game.lock_timer >= game.lock_delay:
-                    game.lock_piece()
+
+        ticks = 0
+        while accumulator >= TICK_MS:
+            accumulator -= TICK_MS
+            ticks += 1
+            if ticks > MAX_TICKS_PER_FRAME:
+                # Zu weit im Rückstand (z. B. nach einem Hänger): Rest verwerfen
+                accumulator = 0.0
+                break
+            actions = pending_actions
+            pending_actions = []
+            if not game.game_over:
+                actions.extend(auto_shift.tick(TICK_MS))
+            if demo and game.game_over:
+                demo_restart_timer += TICK_MS
+                if demo_restart_timer >= DEMO_RESTART_MS:
+                    demo_restart_timer = 0
+                    game = Tetris(10, 20, player_name)
+                    game.autoplayed = True
+                    active_game = game
+            if demo and not game.game_over:
+                if game.current_piece is not bot_piece:
+                    # Neues Stück: beste Platzierung suchen
+                    bot_piece = game.current_piece
+                    bot_actions = bot.choose(game) or [ACTION_HARD_DROP]
+                    bot_timer = 0
+                bot_timer += TICK_MS
+                while bot_actions and bot_timer >= BOT_ACTION_MS:
+                    bot_timer -= BOT_ACTION_MS
+                    actions.append(bot_actions.pop(0))
+            # Aktionen, Lock-Delay und Schwerkraft übernimmt die Spiellogik
+            if not game.game_over:
+                game.step(actions, TICK_MS)
+
+        if current_time >= next_render:
+            next_render = max(next_render + 1 / RENDER_FPS, current_time)
+            if game.paused:
+                screen.fill(BLACK)
+                # Zeichne einen Rahmen um das Spielfeld
+                pygame.draw.rect(screen, WHITE,
+                                 (PLAY_X - 2, PLAY_Y - 2, PLAY_WIDTH + 4, PLAY_HEIGHT + 4),
+                                 2)
+                draw_pause_screen(screen)
             else:
-                game.piece_landed = False
-                game.lock_timer = 0
-        if not game.game_over:
-            fall_time += dt
-            if fall_time >= game.current_fall_speed:
-                fall_time = 0
-                if game.valid_move(game.current_piece, y_offset=1):
-                    game.current_piece.y += 1
-        draw_grid(screen, game.grid)
-        if not game.game_over:
-            shadow_piece = game.get_shadow_piece()
-            draw_piece(screen, shadow_piece, is_shadow=True)
-        if not game.game_over:
-            draw_piece(screen, game.current_piece)
-        draw_next_piece(screen, game.next_piece)
-        draw_held_piece(screen, game.held_piece)
-        draw_score(screen, game.score, game.level, game.lines_cleared, game.player_name)
-        if game.game_over:
-            restart_button, new_profile_button, exit_button = draw_game_over(
-                screen, game.score, game.player_name, game.highscores
-            )
-            restart_button.update(mouse_pos)
-            new_profile_button.update(mouse_pos)
-            exit_button.update(mouse_pos)
-        pygame.display.update()
-        clock.tick(60)
+                renderer.draw(screen, game)
+                if demo:
+                    screen.blit(demo_label, (WIDTH - 150, 30))
+                if game.game_over:
+                    restart_button, new_profile_button, exit_button = draw_game_over(
+                        screen, game.score, game.player_name, game.highscores
+                    )
+                    restart_button.update(mouse_pos)
+                    new_profile_button.update(mouse_pos)
+                    exit_button.update(mouse_pos)
+            pygame.display.update()
+
+        # Bis zum nächsten Tick bzw. Frame schlafen, Eingaben werden danach sofort verarbeitet
+        wait_ms = min(TICK_MS - accumulator,
+                      (next_render - time.perf_counter()) * 1000)
+        if wait_ms > 0:
+            pygame.time.wait(max(1, int(wait_ms)))
+    game.save_replay()
+    # Ausstehende Highscores vor dem Beenden schreiben
+    highscore_store.flush()
     pygame.quit()
     sys.exit()
 
+def replay_game(path, fast=False):
+    """
+    Spielt eine Aufzeichnung mit der pygame-Oberfläche nach: in Echtzeit oder mit
+    fast=True ein Schritt pro Frame, so schnell wie möglich. Am Ende werden die
+    Frame-Zeiten (Simulation + Zeichnen) ausgegeben und der Endstand geprüft.
+    """
+    replay = load_replay(path)
+    pygame.init()
+    info = pygame.display.Info()
+    screen = pygame.display.set_mode(
+        (info.current_w, info.current_h),
+        pygame.FULLSCREEN
+    )
+    pygame.display.set_caption('Tetris - Wiedergabe')
+    update_display_variables(info.current_w, info.current_h)
+
+    game = replay_engine(replay)
+    game.player_name = f"Replay: {replay['player']}"
+    renderer = GameRenderer()
+    clock = pygame.time.Clock()
+    steps = decode_steps(replay["steps"])
+    pending = next(steps, None)
+    replay_time = 0  # Aufgezeichnete Zeit der bereits gespielten Schritte (ms)
+    start_time = pygame.time.get_ticks()
+    frame_times = []
+
+    running = True
+    while running and pending is not None:
+        frame_start = time.perf_counter()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+        if fast:
+            game.step(*pending)
+            pending = next(steps, None)
+        else:
+            # Alle Schritte nachholen, deren aufgezeichneter Zeitpunkt erreicht ist
+            elapsed = pygame.time.get_ticks() - start_time
+            while pending is not None and replay_time + pending[1] <= elapsed:
+                game.step(*pending)
+                replay_time += pending[1]
+                pending = next(steps, None)
+        renderer.draw(screen, game)
+        pygame.display.update()
+        frame_times.append(time.perf_counter() - frame_start)
+        if not fast:
+            clock.tick(60)
+    pygame.quit()
+
+    print(f"Wiedergabe: {path}")
+    print(f"Frames: {len(frame_times)}, Frame-Zeit: {timing_summary(frame_times)}")
+    if pending is None:
+        if check_result(replay, game):
+            print(f"Endstand stimmt überein: {game.score} Punkte, {game.lines_cleared} Zeilen")
+        else:
+            print(f"Abweichung! Aufgezeichnet: {replay['result']}, nachgespielt: "
+                  f"{game.score} Punkte, {game.lines_cleared} Zeilen, {game.pieces_locked} Steine")
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument("--demo", action="store_true",
+                        help="Demo-Modus: der Autoplayer spielt")
+    parser.add_argument("--replay", metavar="DATEI",
+                        help="Aufzeichnung einer Partie nachspielen")
+    parser.add_argument("--fast", action="store_true",
+                        help="Aufzeichnung so schnell wie möglich nachspielen (Frame-Zeit-Benchmark)")
+    args = parser.parse_args()
+    if args.replay:
+        replay_game(args.replay, args.fast)
+    else:
+        main(demo=args.demo)
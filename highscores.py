@@ -0,0 +1,157 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+# Gemeinsame Highscore-Datei aller Spiele im gleichen Verzeichnis wie dieses Skript.
+# Aufbau: {"tetris": [{"name": ..., "score": ..., "date": ...}, ...], ...}
+HIGH_SCORE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "highscores.json")
+
+# Einträge je Tabelle
+MAX_ENTRIES = 10
+
+# Ältere Dateien enthalten nur eine Liste, sie gehört zu Tetris
+LEGACY_BOARD = "tetris"
+
+EMPTY_ENTRY = {"name": "-----", "score": 0, "date": ""}
+
+
+def write_json_atomic(path, data, **dump_args):
+    """
+    Schreibt data als JSON zuerst in eine temporäre Datei im Zielverzeichnis
+    und ersetzt path dann mit os.replace. Leser sehen so immer entweder die
+    alte oder die vollständige neue Datei. Fehler werden weitergereicht.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, **dump_args)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class HighscoreStore:
+    """
+    Highscore-Tabellen mehrerer Spiele (je Spiel ein board) im Speicher.
+    Die Datei wird nur beim ersten Zugriff gelesen; Änderungen werden sofort
+    in der Tabelle übernommen und in einem Hintergrund-Thread über eine
+    temporäre Datei und os.replace geschrieben. So blockiert ein neuer
+    Highscore die Spielschleife nicht, und ein Absturz beim Schreiben
+    hinterlässt nie eine halbe Datei.
+    """
+    def __init__(self, path=HIGH_SCORE_FILE, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.boards = None  # board -> Liste der Einträge, absteigend nach Score
+        self.lock = threading.Lock()
+        self.version = 0        # Anzahl der Änderungen
+        self.saved_version = 0  # zuletzt geschriebener Stand
+        self.writer = None
+
+    def load(self):
+        """Liest die Datei, falls noch nicht geschehen. Fehler ergeben leere Tabellen."""
+        with self.lock:
+            if self.boards is not None:
+                return
+            self.boards = {}
+            if not os.path.exists(self.path):
+                return
+            try:
+                with open(self.path, "r") as file:
+                    data = json.load(file)
+                if isinstance(data, list):
+                    data = {LEGACY_BOARD: data}
+                for board, entries in data.items():
+                    self.boards[board] = sorted(entries, key=lambda x: x["score"],
+                                                reverse=True)[:self.max_entries]
+            except Exception as e:
+                print(f"Fehler beim Laden der Highscores: {e}")
+
+    def get(self, board):
+        """Kopie der Tabelle eines Spiels, absteigend sortiert."""
+        self.load()
+        with self.lock:
+            return list(self.boards.get(board, ()))
+
+    def top(self, board):
+        """Höchster Eintrag eines Spiels oder ein leerer Platzhalter."""
+        entries = self.get(board)
+        return entries[0] if entries else EMPTY_ENTRY
+
+    def submit(self, board, name, score):
+        """
+        Trägt einen Score ein. Jeder Name steht höchstens einmal in der Tabelle,
+        ein vorhandener Eintrag wird nur durch einen höheren Score ersetzt.
+        Gibt True zurück, wenn sich die Tabelle geändert hat; das Schreiben
+        der Datei läuft dann im Hintergrund.
+        """
+        self.load()
+        with self.lock:
+            entries = self.boards.setdefault(board, [])
+            existing = next((entry for entry in entries if entry["name"] == name), None)
+            if existing is not None:
+                if score <= existing["score"]:
+                    print(f"Score {score} nicht gespeichert "
+                          f"(niedriger als vorhandener Score {existing['score']})")
+                    return False
+                entries.remove(existing)
+            elif len(entries) >= self.max_entries and score <= entries[-1]["score"]:
+                return False
+
+            # Einfügen hinter allen Einträgen mit gleichem oder höherem Score
+            index = 0
+            while index < len(entries) and entries[index]["score"] >= score:
+                index += 1
+            date = datetime.now().strftime("%d.%m.%Y %H:%M")
+            entries.insert(index, {"name": name, "score": score, "date": date})
+            del entries[self.max_entries:]
+            if existing is not None:
+                print(f"Highscore für {name} aktualisiert: {existing['score']} -> {score}")
+            else:
+                print(f"Neuer Highscore für {name}: {score} gespeichert!")
+
+            self.version += 1
+            if self.writer is None:
+                # Kein Daemon-Thread; beim Beenden trotzdem flush() aufrufen
+                self.writer = threading.Thread(target=self.write_pending,
+                                               name="highscores")
+                self.writer.start()
+            return True
+
+    def write_pending(self):
+        """Schreibt im Hintergrund, bis der gespeicherte Stand aktuell ist."""
+        while True:
+            with self.lock:
+                if self.saved_version == self.version:
+                    self.writer = None
+                    return
+                version = self.version
+                data = {board: list(entries) for board, entries in self.boards.items()}
+            self.write_file(data)
+            with self.lock:
+                self.saved_version = version
+
+    def write_file(self, data):
+        """Schreibt die Tabellen atomar (siehe write_json_atomic)."""
+        try:
+            write_json_atomic(self.path, data)
+        except Exception as e:
+            print(f"Fehler beim Speichern der Highscores: {e}")
+
+    def flush(self, timeout=None):
+        """Wartet, bis alle ausstehenden Änderungen geschrieben sind."""
+        writer = self.writer
+        if writer is not None:
+            writer.join(timeout)
+
+
+# Gemeinsame Instanz für alle Spiele
+highscore_store = HighscoreStore()
@@ -370,6 +370,7 @@ class GameLauncher:
                 "Obere Pfeiltaste  ->  Rotiert das Tetromino",
                 "Leertaste  ->  Hard Drop (sofort absetzen)",
                 "C oder Linke Umschalttaste  ->  Hold-Funktion",
+                "D  ->  Demo-Modus (Autoplayer an/aus)",
                 "ESC  ->  Pause / Menü",
                 "F  ->  Vollbild bzw. Fenster",
             ]
@@ -0,0 +1,99 @@
+import argparse
+import time
+
+from tetris_engine import (
+    BOARD_WIDTH, BOARD_HEIGHT, RANDOMIZERS, DEFAULT_RANDOMIZER, ACTION_HARD_DROP, TetrisEngine,
+    TetrisBot,
+)
+from tetris_replay import load_replay, run_replay, check_result, timing_summary
+
+
+def play_bot_game(seed, bot, max_pieces, size=(BOARD_WIDTH, BOARD_HEIGHT),
+                  randomizer=DEFAULT_RANDOMIZER):
+    """
+    Lässt den Autoplayer eine Partie ohne Oberfläche spielen, bis zum Game Over
+    oder bis max_pieces Steine gesetzt sind. Gibt die Spiellogik zurück.
+    """
+    game = TetrisEngine(size[0], size[1], seed=seed, randomizer=randomizer)
+    while not game.game_over and game.pieces_locked < max_pieces:
+        actions = bot.choose(game) or [ACTION_HARD_DROP]
+        game.step(actions, 0)
+    return game
+
+
+def benchmark_bot(games, seed, max_pieces, use_hold, size=(BOARD_WIDTH, BOARD_HEIGHT),
+                  randomizer=DEFAULT_RANDOMIZER):
+    """
+    Spielt games Partien mit dem Autoplayer und gibt bewertete Platzierungen
+    pro Sekunde, gesetzte Steine pro Sekunde sowie Zeilen und Punkte je Partie aus.
+    """
+    bot = TetrisBot(use_hold=use_hold)
+    results = []
+    start = time.perf_counter()
+    for game_index in range(games):
+        game = play_bot_game(seed + game_index, bot, max_pieces, size, randomizer)
+        results.append(game)
+        print(f"Partie {game_index + 1:3d}: {game.pieces_locked:6d} Steine, "
+              f"{game.lines_cleared:6d} Zeilen, {game.score:8d} Punkte"
+              f"{', Game Over' if game.game_over else ''}")
+    duration = time.perf_counter() - start
+
+    pieces = sum(game.pieces_locked for game in results)
+    lines = sum(game.lines_cleared for game in results)
+    game_overs = sum(1 for game in results if game.game_over)
+    print()
+    print(f"Spielfeld: {size[0]}x{size[1]}, Partien: {games}, Seed: {seed}, "
+          f"max. Steine: {max_pieces}, Hold: {'ja' if use_hold else 'nein'}, "
+          f"Zufallsgenerator: {randomizer}")
+    print(f"Dauer:              {duration:8.2f} s")
+    print(f"Platzierungen/s:    {bot.placements / duration:8.0f}")
+    print(f"Steine/s:           {pieces / duration:8.0f}")
+    print(f"Ø Zeilen je Partie: {lines / games:8.1f}")
+    print(f"Ø Punkte je Partie: {sum(game.score for game in results) / games:8.0f}")
+    print(f"Game Over:          {game_overs}/{games}")
+
+
+def benchmark_replays(paths):
+    """
+    Spielt Aufzeichnungen ohne Oberfläche so schnell wie möglich nach, gibt die
+    Schrittzeiten aus und prüft, ob der Endstand mit der Aufzeichnung übereinstimmt.
+    """
+    mismatches = 0
+    for path in paths:
+        replay = load_replay(path)
+        start = time.perf_counter()
+        game, timings = run_replay(replay)
+        duration = time.perf_counter() - start
+        matches = check_result(replay, game)
+        mismatches += not matches
+        print(f"{path}")
+        print(f"  Schritte: {len(timings)}, Dauer: {duration * 1000:.1f} ms "
+              f"({len(timings) / duration:.0f} Schritte/s)")
+        print(f"  Schrittzeit: {timing_summary(timings)}")
+        print(f"  Endstand: {game.score} Punkte, {game.lines_cleared} Zeilen, "
+              f"{game.pieces_locked} Steine - {'stimmt überein' if matches else 'ABWEICHUNG'}")
+    print(f"Aufzeichnungen: {len(paths)}, Abweichungen: {mismatches}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks für die Tetris-Spiellogik")
+    parser.add_argument("mode", nargs="?", default="bot", choices=("bot", "replay"),
+                        help="bot: Partien des Autoplayers, "
+                             "replay: Aufzeichnungen nachspielen")
+    parser.add_argument("replays", nargs="*", metavar="DATEI",
+                        help="Aufzeichnungen für replay")
+    parser.add_argument("--games", type=int, default=10, help="Anzahl der Partien")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert des Zufallsgenerators")
+    parser.add_argument("--max-pieces", type=int, default=1000,
+                        help="Partie nach so vielen Steinen beenden")
+    parser.add_argument("--no-hold", action="store_true", help="Autoplayer ohne Hold-Funktion")
+    parser.add_argument("--width", type=int, default=BOARD_WIDTH, help="Spalten")
+    parser.add_argument("--height", type=int, default=BOARD_HEIGHT, help="Zeilen")
+    parser.add_argument("--randomizer", default=DEFAULT_RANDOMIZER, choices=RANDOMIZERS,
+                        help="Zufallsgenerator der Stückfolge")
+    args = parser.parse_args()
+    if args.mode == "replay":
+        benchmark_replays(args.replays)
+    else:
+        benchmark_bot(args.games, args.seed, args.max_pieces, not args.no_hold,
+                      (args.width, args.height), args.randomizer)
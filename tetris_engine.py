@@ -0,0 +1,807 @@
+import random
+from collections import deque
+from itertools import islice
+
+# Standardgröße des Spielfelds
+BOARD_WIDTH = 10
+BOARD_HEIGHT = 20
+
+# Fallgeschwindigkeit in ms je Zeile: Start, Abnahme je Level und Minimum
+START_FALL_SPEED = 250
+FALL_SPEED_STEP = 30
+MIN_FALL_SPEED = 50
+
+# Lock-Delay beim Setzen eines Stücks in ms
+LOCK_DELAY = 400
+
+# Feste Logikrate: Die Oberfläche ruft step() unabhängig von der Bildrate
+# immer mit TICK_MS auf, so laufen Schwerkraft und Tastenwiederholung gleichmäßig
+TICK_RATE = 240
+TICK_MS = 1000 / TICK_RATE
+
+# Tastenwiederholung (ms): Delayed Auto Shift bis zur ersten Wiederholung,
+# danach Auto Repeat Rate (0 = sofort bis zur Wand), Soft Drop je Zeile.
+# Die Werte entsprechen der bisherigen Tastenwiederholung (150 ms, dann 7 pro Sekunde).
+DAS_MS = 150
+ARR_MS = 1000 // 7
+SOFT_DROP_MS = 1000 // 7
+
+# Punkte für 1 bis 4 gleichzeitig gelöschte Zeilen (mal Level + 1)
+LINE_SCORES = (0, 40, 100, 300, 1200)
+
+# Zufallsgenerator für die Stückfolge: "bag" mischt jeweils alle sieben Formen
+# (7-Bag, keine langen Durststrecken), "uniform" zieht jedes Stück unabhängig
+RANDOMIZERS = ("bag", "uniform")
+DEFAULT_RANDOMIZER = "bag"
+
+# Anzahl der Stücke in der Vorschau
+PREVIEW_COUNT = 5
+
+# Farbe leerer Zellen im Farbgitter
+EMPTY = (0, 0, 0)
+
+# Aktionen für TetrisEngine.step
+ACTION_LEFT = "left"
+ACTION_RIGHT = "right"
+ACTION_DOWN = "down"
+ACTION_ROTATE = "rotate"
+ACTION_HARD_DROP = "hard_drop"
+ACTION_HOLD = "hold"
+ACTIONS = (ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP, ACTION_HOLD)
+
+# -----------------------------------------------------------------------------
+# Tetromino-Formen und daraus berechnete Tabellen
+# -----------------------------------------------------------------------------
+# Farbkodierungen der Tetrominoes
+COLORS = [
+    (0, 240, 240),  # Hellblau (I)
+    (0, 0, 240),    # Blau (J)
+    (240, 160, 0),  # Orange (L)
+    (240, 240, 0),  # Gelb (O)
+    (0, 240, 0),    # Grün (S)
+    (160, 0, 240),  # Lila (T)
+    (240, 0, 0)     # Rot (Z)
+]
+
+# Definition der Tetromino-Formen (jede Form als Liste von Rotationen)
+SHAPES = [
+    [
+        ['.....',
+         '.....',
+         '.....',
+         'OOOO.',
+         '.....'],
+        ['.....',
+         '..O..',
+         '..O..',
+         '..O..',
+         '..O..']
+    ],
+    [
+        ['.....',
+         '.....',
+         '..O..',
+         '.OOO.',
+         '.....'],
+        ['.....',
+         '..O..',
+         '.OO..',
+         '..O..',
+         '.....'],
+        ['.....',
+         '.....',
+         '.OOO.',
+         '..O..',
+         '.....'],
+        ['.....',
+         '..O..',
+         '..OO.',
+         '..O..',
+         '.....']
+    ],
+    [
+        ['.....',
+         '.....',
+         '..OO.',
+         '.OO..',
+         '.....'],
+        ['.....',
+         '.O...',
+         '.OO..',
+         '..O..',
+         '.....']
+    ],
+    [
+        ['.....',
+         '.....',
+         '.OO..',
+         '..OO.',
+         '.....'],
+        ['.....',
+         '..O..',
+         '.OO..',
+         '.O...',
+         '.....']
+    ],
+    [
+        ['.....',
+         '.....',
+         '.OOO.',
+         '.O...',
+         '.....'],
+        ['.....',
+         '.OO..',
+         '..O..',
+         '..O..',
+         '.....'],
+        ['.....',
+         '.....',
+         '...O.',
+         '.OOO.',
+         '.....'],
+        ['.....',
+         '.O...',
+         '.O...',
+         '.OO..',
+         '.....']
+    ],
+    [
+        ['.....',
+         '.....',
+         '.OOO.',
+         '...O.',
+         '.....'],
+        ['.....',
+         '..O..',
+         '..O..',
+         '.OO..',
+         '.....'],
+        ['.....',
+         '.....',
+         '.O...',
+         '.OOO.',
+         '.....'],
+        ['.....',
+         '.OO..',
+         '.O...',
+         '.O...',
+         '.....']
+    ],
+    [
+        ['.....',
+         '.....',
+         '.OO..',
+         '.OO..',
+         '.....']
+    ]
+]
+
+def compile_offsets(shape):
+    """
+    Wandelt die 5x5-Vorlagen einer Form in Tupel aus (dx, dy)-Versätzen um,
+    eines je Rotation.
+    """
+    rotations = []
+    for form in shape:
+        offsets = []
+        for i, line in enumerate(form):
+            for j, column in enumerate(line):
+                if column == "O":
+                    offsets.append((j, i))
+        rotations.append(tuple(offsets))
+    return tuple(rotations)
+
+def compile_bounds(rotations):
+    """Begrenzungsrahmen (min_dx, min_dy, max_dx, max_dy) je Rotation."""
+    return tuple((min(dx for dx, _ in offsets), min(dy for _, dy in offsets),
+                  max(dx for dx, _ in offsets), max(dy for _, dy in offsets))
+                 for offsets in rotations)
+
+# Das Spielfeld wird zusätzlich als Bitmasken geführt: Jede Zeile ist eine
+# Ganzzahl, in der Bit WALL + x für Spalte x steht. Links und rechts liegen
+# jeweils WALL gesetzte Bits als Wand, damit ein Stück mit einer einzigen
+# UND-Verknüpfung pro Zeile gegen Blöcke und Ränder geprüft werden kann.
+WALL = 4
+
+def compile_row_masks(rotations):
+    """
+    Fasst die Versätze jeder Rotation zu Tupeln aus (dy, Bitmaske) zusammen.
+    Bit dx der Maske steht für Spalte dx der Vorlage, leere Zeilen entfallen.
+    """
+    masks = []
+    for offsets in rotations:
+        rows = {}
+        for dx, dy in offsets:
+            rows[dy] = rows.get(dy, 0) | (1 << dx)
+        masks.append(tuple(sorted(rows.items())))
+    return tuple(masks)
+
+def compile_column_bottoms(rotations):
+    """
+    Unterste Zelle jeder belegten Spalte als Tupel aus (dx, dy) je Rotation,
+    daraus ergibt sich die Fallhöhe aus den Spaltenprofilen des Spielfelds.
+    """
+    bottoms = []
+    for offsets in rotations:
+        columns = {}
+        for dx, dy in offsets:
+            columns[dx] = max(columns.get(dx, dy), dy)
+        bottoms.append(tuple(sorted(columns.items())))
+    return tuple(bottoms)
+
+# Tabellen je Form-ID (Index in SHAPES), einmalig beim Import berechnet
+PIECE_OFFSETS = [compile_offsets(shape) for shape in SHAPES]
+PIECE_BOUNDS = [compile_bounds(rotations) for rotations in PIECE_OFFSETS]
+PIECE_ROW_MASKS = [compile_row_masks(rotations) for rotations in PIECE_OFFSETS]
+PIECE_COLUMN_BOTTOMS = [compile_column_bottoms(rotations) for rotations in PIECE_OFFSETS]
+I_PIECE = 0
+
+# Seitliche Verschiebungen, die beim Drehen der Reihe nach probiert werden
+WALL_KICKS = (0, -1, 1)
+I_PIECE_KICKS = (0, -1, 1, -2, 2)
+
+
+# -----------------------------------------------------------------------------
+# Stücke
+# -----------------------------------------------------------------------------
+class Tetromino:
+    """
+    Repräsentiert ein Tetromino.
+    """
+    def __init__(self, x, y, shape_id):
+        self.x = x
+        self.y = y
+        self.shape_id = shape_id
+        self.color = COLORS[shape_id]
+        self.offsets = PIECE_OFFSETS[shape_id]
+        self.row_masks = PIECE_ROW_MASKS[shape_id]
+        self.rotation = 0
+
+    def get_offsets(self):
+        """
+        Gibt die (dx, dy)-Versätze der aktuellen Rotation zurück (ohne neue Liste).
+        """
+        return self.offsets[self.rotation % len(self.offsets)]
+
+    def get_bounds(self):
+        """
+        Gibt den Begrenzungsrahmen (min_dx, min_dy, max_dx, max_dy) der aktuellen Rotation zurück.
+        """
+        bounds = PIECE_BOUNDS[self.shape_id]
+        return bounds[self.rotation % len(bounds)]
+
+    def get_positions(self):
+        """
+        Gibt eine Liste der (x,y)-Positionen zurück, an denen das Tetromino aktuell gezeichnet wird.
+        """
+        return [(self.x + dx, self.y + dy) for dx, dy in self.get_offsets()]
+
+
+# -----------------------------------------------------------------------------
+# Spielregeln ohne Anzeige, Zeitmessung und Dateizugriffe
+# -----------------------------------------------------------------------------
+class TetrisEngine:
+    """
+    Reine Spiellogik von Tetris: Spielfeld, Stücke, Punkte, Schwerkraft und
+    Lock-Delay. Die Zeit wird über step() von außen vorgegeben und der
+    Zufallsgenerator ist über seed reproduzierbar, so dass das Spiel ohne
+    pygame für Bots, Tests und Benchmarks laufen kann.
+    """
+    def __init__(self, width=BOARD_WIDTH, height=BOARD_HEIGHT, seed=None, verbose=False,
+                 randomizer=DEFAULT_RANDOMIZER, preview_count=PREVIEW_COUNT):
+        if randomizer not in RANDOMIZERS:
+            raise ValueError(f"Unbekannter Zufallsgenerator: {randomizer}")
+        self.width = width
+        self.height = height
+        # Ohne Vorgabe wird ein Startwert gezogen und gemerkt, damit sich
+        # jede Partie (z. B. aus einer Aufzeichnung) nachspielen lässt
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+        self.randomizer = randomizer
+        # Warteschlange der kommenden Stücke, queue[0] ist das nächste
+        self.preview_count = max(1, preview_count)
+        self.queue = deque()
+        # grid enthält nur noch die Farben, belegt ist eine Zelle laut rows
+        self.grid = [[EMPTY for _ in range(width)] for _ in range(height)]
+        self.wall_mask = ((1 << WALL) - 1) | (((1 << WALL) - 1) << (width + WALL))
+        self.full_row = (1 << (width + 2 * WALL)) - 1
+        self.rows = [self.wall_mask] * height
+        # Spaltenprofile: Bit y steht für eine belegte Zelle in Zeile y,
+        # Bit height für den Boden
+        self.floor_mask = 1 << height
+        self.columns = [self.floor_mask] * width
+        # Fallhöhe und Schatten werden nur neu berechnet, wenn sich Stück,
+        # Position, Rotation oder Spielfeld (grid_version) ändern
+        self.grid_version = 0
+        self.drop_key = None
+        self.drop_cache = 0
+        self.shadow_piece = None
+        self.current_piece = self.new_piece()
+        self.score = 0
+        self.level = 0
+        self.lines_cleared = 0
+        self.pieces_locked = 0
+        self.game_over = False
+        self.current_fall_speed = START_FALL_SPEED  # Fallgeschwindigkeit (ms)
+        self.fall_time = 0
+        self.held_piece = None
+        self.can_hold = True  # Ermöglicht das einmalige Halten eines Stücks pro Drop
+
+        # Lock-Delay beim Setzen eines Stücks
+        self.lock_delay = LOCK_DELAY
+        self.lock_timer = 0
+        self.piece_landed = False
+
+    def rotation_kick(self, piece):
+        """
+        Gibt die seitliche Verschiebung zurück, mit der sich piece drehen lässt
+        (0 ohne Wall-Kick), oder None, falls keine Drehung möglich ist.
+        """
+        kicks = I_PIECE_KICKS if piece.shape_id == I_PIECE else WALL_KICKS
+        for x_offset in kicks:
+            if self.valid_move(piece, x_offset=x_offset, rotation=1):
+                return x_offset
+        return None
+
+    def try_rotation(self):
+        """
+        Versucht, das aktuelle Tetromino zu rotieren.
+        Falls eine Kollision (z. B. an der Wand) besteht, werden sogenannte Wall-Kicks ausprobiert.
+        """
+        x_offset = self.rotation_kick(self.current_piece)
+        if x_offset is not None:
+            self.current_piece.x += x_offset
+            self.current_piece.rotation += 1
+            if self.piece_landed:
+                self.lock_timer = 0
+
+    def hold_piece(self):
+        """
+        Ermöglicht es dem Spieler, das aktuelle Tetromino zu "halten" (auszuwechseln).
+        Wird nur einmal pro Stückzug ausgeführt.
+        """
+        if not self.can_hold:
+            return
+        if self.held_piece:
+            self.current_piece, self.held_piece = self.held_piece, self.current_piece
+            self.current_piece.x = self.width // 2 - 2
+            self.current_piece.y = 0
+            self.current_piece.rotation = 0
+        else:
+            self.held_piece = self.current_piece
+            self.current_piece = self.new_piece()
+        self.can_hold = False
+        self.piece_landed = False
+        self.lock_timer = 0
+
+    @property
+    def next_piece(self):
+        """Das nächste Stück aus der Warteschlange."""
+        return self.queue[0]
+
+    def preview(self):
+        """Form-IDs der nächsten preview_count Stücke."""
+        return tuple(piece.shape_id for piece in islice(self.queue, self.preview_count))
+
+    def fill_queue(self):
+        """
+        Füllt die Warteschlange auf, bis sie mehr Stücke als die Vorschau enthält.
+        Beim 7-Bag wird immer ein ganzer gemischter Satz aller Formen angehängt.
+        """
+        while len(self.queue) <= self.preview_count:
+            if self.randomizer == "bag":
+                shape_ids = list(range(len(SHAPES)))
+                self.rng.shuffle(shape_ids)
+            else:
+                shape_ids = [self.rng.randrange(len(SHAPES))]
+            for shape_id in shape_ids:
+                self.queue.append(Tetromino(self.width // 2 - 2, 0, shape_id))
+
+    def new_piece(self):
+        """
+        Nimmt das nächste Tetromino aus der Warteschlange; es erscheint an der Startposition.
+        """
+        self.fill_queue()
+        piece = self.queue.popleft()
+        self.fill_queue()
+        return piece
+    
+    def valid_move(self, piece, x_offset=0, y_offset=0, rotation=0):
+        """
+        Überprüft, ob eine Bewegung (Verschiebung und/oder Rotation) gültig ist,
+        also nicht in einen bereits besetzten Bereich oder außerhalb des Spielfelds führt.
+        """
+        masks = piece.row_masks[(piece.rotation + rotation) % len(piece.row_masks)]
+        shift = piece.x + x_offset + WALL
+        if shift < 0:
+            return False
+        top = piece.y + y_offset
+        for i, mask in masks:
+            y = top + i
+            if y >= self.height:
+                return False
+            # Oberhalb des Spielfelds zählen nur die Wände
+            row = self.rows[y] if y >= 0 else self.wall_mask
+            if row & (mask << shift):
+                return False
+        return True
+    
+    def clear_lines(self):
+        """
+        Löscht volle Zeilen im Gitter, aktualisiert den Punktestand und passt das Level an.
+        Gibt die Anzahl gelöschter Zeilen zurück.
+        """
+        lines_to_clear = [i for i, row in enumerate(self.rows) if row == self.full_row]
+        self.score += LINE_SCORES[len(lines_to_clear)] * (self.level + 1)
+        for line in reversed(lines_to_clear):
+            del self.grid[line]
+            del self.rows[line]
+        for _ in lines_to_clear:
+            self.grid.insert(0, [EMPTY for _ in range(self.width)])
+            self.rows.insert(0, self.wall_mask)
+        if lines_to_clear:
+            self.columns = [self.floor_mask] * self.width
+            for y, row in enumerate(self.rows):
+                for x in range(self.width):
+                    if row >> (x + WALL) & 1:
+                        self.columns[x] |= 1 << y
+        self.lines_cleared += len(lines_to_clear)
+        old_level = self.level
+        self.level = self.lines_cleared // 10
+        if self.level > old_level:
+            self.current_fall_speed = max(MIN_FALL_SPEED,
+                                          START_FALL_SPEED - self.level * FALL_SPEED_STEP)
+            if self.verbose:
+                print(f"Level up! Neues Level: {self.level}, Geschwindigkeit: {self.current_fall_speed}")
+        return len(lines_to_clear)
+    
+    def drop_distance(self):
+        """
+        Gibt zurück, um wie viele Zeilen das aktuelle Tetromino noch fallen kann.
+        Das Ergebnis wird zwischengespeichert, bis sich Stück oder Spielfeld ändern.
+        """
+        piece = self.current_piece
+        key = (piece, piece.x, piece.y, piece.rotation, self.grid_version)
+        if key != self.drop_key:
+            self.drop_key = key
+            self.drop_cache = self.compute_drop_distance(piece)
+        return self.drop_cache
+
+    def compute_drop_distance(self, piece):
+        """
+        Berechnet die Fallhöhe aus den Spaltenprofilen: Je Spalte des Stücks wird
+        die erste belegte Zelle unterhalb seiner untersten Zelle gesucht.
+        """
+        bottoms = PIECE_COLUMN_BOTTOMS[piece.shape_id]
+        distance = self.height
+        for dx, dy in bottoms[piece.rotation % len(bottoms)]:
+            below = piece.y + dy + 1
+            column = self.columns[piece.x + dx]
+            column = column >> below if below >= 0 else column << -below
+            # Anzahl freier Zellen bis zum niedrigsten gesetzten Bit
+            distance = min(distance, (column & -column).bit_length() - 1)
+        return distance
+
+    def get_shadow_piece(self):
+        """
+        Gibt eine "Schatten"-Version des aktuellen Tetrominos zurück, die anzeigt,
+        wo das Stück landen wird. Sie wird nur bei Änderungen neu erzeugt.
+        """
+        if self.game_over:
+            return None
+        piece = self.current_piece
+        shadow_y = piece.y + self.drop_distance()
+        shadow = self.shadow_piece
+        if (shadow is None or shadow.shape_id != piece.shape_id or shadow.x != piece.x
+                or shadow.y != shadow_y or shadow.rotation != piece.rotation):
+            shadow = Tetromino(piece.x, shadow_y, piece.shape_id)
+            shadow.rotation = piece.rotation
+            self.shadow_piece = shadow
+        return shadow
+
+    def hard_drop(self):
+        """
+        Lässt das aktuelle Tetromino sofort bis zur Landeposition fallen und setzt es ab.
+        """
+        self.current_piece.y += self.drop_distance()
+        self.lock_piece()
+    
+    def lock_piece(self):
+        """
+        Setzt das aktuelle Tetromino endgültig in das Gitter ein (blockiert seine Position),
+        löscht nötige Zeilen und prüft, ob das Spiel vorbei ist (Game Over).
+        """
+        piece = self.current_piece
+        top_blocked = piece.y + piece.get_bounds()[1] < 0
+        for dx, dy in piece.get_offsets():
+            x = piece.x + dx
+            y = piece.y + dy
+            if y >= 0:
+                self.grid[y][x] = piece.color
+                self.rows[y] |= 1 << (x + WALL)
+                self.columns[x] |= 1 << y
+        self.grid_version += 1
+        self.pieces_locked += 1
+        self.clear_lines()
+        self.current_piece = self.new_piece()
+        self.can_hold = True
+        self.piece_landed = False
+        self.lock_timer = 0
+        if top_blocked or not self.valid_move(self.current_piece):
+            self.game_over = True
+
+    def move(self, x_offset):
+        """
+        Verschiebt das aktuelle Tetromino seitlich, falls möglich. Liegt es
+        bereits auf, beginnt der Lock-Delay von vorn.
+        """
+        if self.valid_move(self.current_piece, x_offset=x_offset):
+            self.current_piece.x += x_offset
+            if self.piece_landed:
+                self.lock_timer = 0
+            return True
+        return False
+
+    def soft_drop(self):
+        """
+        Bewegt das aktuelle Tetromino um eine Zeile nach unten, falls möglich.
+        """
+        if self.drop_distance() > 0:
+            self.current_piece.y += 1
+            return True
+        return False
+
+    def apply_action(self, action):
+        """
+        Führt eine einzelne Aktion (siehe ACTIONS) sofort aus.
+        """
+        if action == ACTION_LEFT:
+            self.move(-1)
+        elif action == ACTION_RIGHT:
+            self.move(1)
+        elif action == ACTION_DOWN:
+            self.soft_drop()
+        elif action == ACTION_ROTATE:
+            self.try_rotation()
+        elif action == ACTION_HARD_DROP:
+            self.hard_drop()
+        elif action == ACTION_HOLD:
+            self.hold_piece()
+        else:
+            raise ValueError(f"Unbekannte Aktion: {action}")
+
+    def step(self, actions=(), dt_ms=0):
+        """
+        Führt einen Simulationsschritt aus: zuerst die Aktionen in der
+        angegebenen Reihenfolge, danach Lock-Delay und Schwerkraft für dt_ms
+        Millisekunden. Gibt die Anzahl der dabei gelöschten Zeilen zurück.
+        """
+        lines_before = self.lines_cleared
+        for action in actions:
+            if self.game_over:
+                break
+            self.apply_action(action)
+        if not self.game_over:
+            if self.drop_distance() == 0:
+                self.piece_landed = True
+                self.lock_timer += dt_ms
+                if self.lock_timer >= self.lock_delay:
+                    self.lock_piece()
+            else:
+                self.piece_landed = False
+                self.lock_timer = 0
+        if not self.game_over:
+            self.fall_time += dt_ms
+            if self.fall_time >= self.current_fall_speed:
+                self.fall_time = 0
+                self.soft_drop()
+        return self.lines_cleared - lines_before
+
+
+# -----------------------------------------------------------------------------
+# Tastenwiederholung
+# -----------------------------------------------------------------------------
+class AutoShift:
+    """
+    Wandelt gehaltene Tasten pro Logik-Tick in Aktionen um: Links/Rechts mit
+    Delayed Auto Shift (DAS) und Auto Repeat Rate (ARR), Soft Drop mit fester
+    Rate. Sind beide Richtungen gedrückt, gilt die zuletzt gedrückte.
+    Wiederholungen werden aus der Haltedauer berechnet, damit ihre Anzahl
+    nicht von der Tick-Länge abhängt.
+    """
+    def __init__(self, das_ms=DAS_MS, arr_ms=ARR_MS, soft_drop_ms=SOFT_DROP_MS, width=BOARD_WIDTH):
+        self.das_ms = das_ms
+        self.arr_ms = arr_ms
+        self.soft_drop_ms = soft_drop_ms
+        self.width = width
+        self.reset()
+
+    def reset(self):
+        """Vergisst alle gehaltenen Tasten (z. B. bei Pause oder neuer Partie)."""
+        self.directions = []  # gehaltene Richtungen, die zuletzt gedrückte am Ende
+        self.shift_time = 0
+        self.shift_repeats = 0
+        self.soft_drop = False
+        self.soft_drop_time = 0
+        self.soft_drop_repeats = 0
+
+    def press(self, action):
+        """
+        Taste gedrückt: Gibt die sofort auszuführenden Aktionen zurück.
+        """
+        if action in (ACTION_LEFT, ACTION_RIGHT):
+            if action in self.directions:
+                self.directions.remove(action)
+            self.directions.append(action)
+            self.shift_time = 0
+            self.shift_repeats = 0
+        elif action == ACTION_DOWN:
+            self.soft_drop = True
+            self.soft_drop_time = 0
+            self.soft_drop_repeats = 0
+        return [action]
+
+    def release(self, action):
+        """Taste losgelassen. Bleibt die andere Richtung gedrückt, beginnt ihr DAS neu."""
+        if action in self.directions:
+            if self.directions[-1] == action:
+                self.shift_time = 0
+                self.shift_repeats = 0
+            self.directions.remove(action)
+        elif action == ACTION_DOWN:
+            self.soft_drop = False
+
+    def tick(self, dt_ms):
+        """Gibt die Wiederholungen zurück, die in diesem Tick fällig werden."""
+        actions = []
+        # Gerundet, damit sich Rundungsfehler von Bruchteil-Ticks (1000 / 240)
+        # nicht aufsummieren und eine Wiederholung um einen Tick verschieben
+        if self.directions:
+            self.shift_time = round(self.shift_time + dt_ms, 6)
+            if self.shift_time >= self.das_ms:
+                if self.arr_ms <= 0:
+                    due = self.width
+                else:
+                    due = 1 + int((self.shift_time - self.das_ms) // self.arr_ms)
+                actions.extend([self.directions[-1]] * (due - self.shift_repeats))
+                self.shift_repeats = due
+        if self.soft_drop:
+            self.soft_drop_time = round(self.soft_drop_time + dt_ms, 6)
+            due = int(self.soft_drop_time // self.soft_drop_ms)
+            actions.extend([ACTION_DOWN] * (due - self.soft_drop_repeats))
+            self.soft_drop_repeats = due
+        return actions
+
+
+# -----------------------------------------------------------------------------
+# Autoplayer: Platzierungssuche mit merkmalsbasierter Bewertung
+# -----------------------------------------------------------------------------
+# Gewichte der Merkmale (nach den bekannten Werten von Yiyuan Lee):
+# Summe der Spaltenhöhen, gelöschte Zeilen, Löcher und Unebenheit
+BOT_WEIGHTS = {
+    "height": -0.510066,
+    "lines": 0.760666,
+    "holes": -0.35663,
+    "bumpiness": -0.184483,
+}
+
+
+def find_placements(engine, piece):
+    """
+    Sucht alle Landepositionen, die piece von seiner aktuellen Lage aus durch
+    Drehen (mit Wall-Kicks), seitliches Verschieben und Hard Drop erreicht.
+    Gibt eine Liste von (Aktionen, Tetromino in Landeposition) zurück,
+    jede Endlage nur einmal.
+    """
+    placements = []
+    seen = set()
+    probe = Tetromino(piece.x, piece.y, piece.shape_id)
+    probe.rotation = piece.rotation
+    rotations = len(piece.offsets)
+    for turns in range(rotations):
+        if turns:
+            x_offset = engine.rotation_kick(probe)
+            if x_offset is None:
+                break
+            probe.x += x_offset
+            probe.rotation += 1
+        shifts = [(0, ())]
+        for step, action in ((-1, ACTION_LEFT), (1, ACTION_RIGHT)):
+            distance = step
+            while engine.valid_move(probe, x_offset=distance):
+                shifts.append((distance, (action,) * abs(distance)))
+                distance += step
+        for x_offset, moves in shifts:
+            landed = Tetromino(probe.x + x_offset, probe.y, probe.shape_id)
+            landed.rotation = probe.rotation
+            landed.y += engine.compute_drop_distance(landed)
+            key = (landed.rotation % rotations, landed.x, landed.y)
+            if key not in seen:
+                seen.add(key)
+                placements.append(((ACTION_ROTATE,) * turns + moves + (ACTION_HARD_DROP,),
+                                   landed))
+    return placements
+
+
+def placement_features(engine, piece):
+    """
+    Legt piece probeweise auf einer Kopie der Zeilenmasken ab und gibt
+    (Summe der Höhen, gelöschte Zeilen, Löcher, Unebenheit) zurück, oder
+    None, falls das Stück über den oberen Rand hinausragt.
+    """
+    rows = engine.rows[:]
+    shift = piece.x + WALL
+    for dy, mask in piece.row_masks[piece.rotation % len(piece.row_masks)]:
+        y = piece.y + dy
+        if y < 0:
+            return None
+        rows[y] |= mask << shift
+    full_row = engine.full_row
+    kept = [row for row in rows if row != full_row]
+    lines = len(rows) - len(kept)
+
+    # Von oben nach unten: Die erste belegte Zelle einer Spalte bestimmt
+    # ihre Höhe, jede leere Zelle darunter ist ein Loch.
+    field = full_row & ~engine.wall_mask
+    heights = [0] * engine.width
+    covered = 0
+    holes = 0
+    for i, row in enumerate(kept):
+        cells = row & field
+        new = cells & ~covered
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1 - WALL] = len(kept) - i
+            new ^= low
+        holes += bin(covered & ~cells).count("1")
+        covered |= cells
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return sum(heights), lines, holes, bumpiness
+
+
+class TetrisBot:
+    """
+    Autoplayer für TetrisEngine. Für das aktuelle Stück und das Stück, das
+    per Hold an seine Stelle käme, werden alle erreichbaren Platzierungen
+    bewertet. choose() liefert die Aktionen für die beste davon.
+    placements zählt die bewerteten Platzierungen (für Benchmarks).
+    """
+    def __init__(self, weights=None, use_hold=True):
+        self.weights = weights or BOT_WEIGHTS
+        self.use_hold = use_hold
+        self.placements = 0
+
+    def evaluate(self, features):
+        height, lines, holes, bumpiness = features
+        weights = self.weights
+        return (weights["height"] * height + weights["lines"] * lines
+                + weights["holes"] * holes + weights["bumpiness"] * bumpiness)
+
+    def choose(self, engine):
+        """
+        Gibt die Aktionen für die beste Platzierung zurück, oder None, falls
+        jede Platzierung das Spiel beendet.
+        """
+        candidates = [((), engine.current_piece)]
+        if self.use_hold and engine.can_hold:
+            swap = engine.held_piece or engine.next_piece
+            if swap.shape_id != engine.current_piece.shape_id:
+                # Nach dem Halten erscheint das getauschte Stück an der Startposition
+                candidates.append(((ACTION_HOLD,),
+                                   Tetromino(engine.width // 2 - 2, 0, swap.shape_id)))
+        best_actions = None
+        best_value = None
+        for prefix, piece in candidates:
+            for actions, landed in find_placements(engine, piece):
+                self.placements += 1
+                features = placement_features(engine, landed)
+                if features is None:
+                    continue
+                value = self.evaluate(features)
+                if best_value is None or value > best_value:
+                    best_value = value
+                    best_actions = prefix + actions
+        return list(best_actions) if best_actions is not None else None
@@ -0,0 +1,184 @@
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+from highscores import write_json_atomic
+from tetris_engine import (
+    ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP, ACTION_HOLD,
+    TetrisEngine,
+)
+
+# Verzeichnis für Aufzeichnungen und Anzahl der Dateien, die behalten werden
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tetris_replays")
+REPLAY_KEEP = 20
+REPLAY_VERSION = 1
+
+# Ein Buchstabe je Aktion für das kompakte Dateiformat
+ACTION_CODES = {
+    ACTION_LEFT: "L",
+    ACTION_RIGHT: "R",
+    ACTION_DOWN: "D",
+    ACTION_ROTATE: "U",
+    ACTION_HARD_DROP: "H",
+    ACTION_HOLD: "C",
+}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+
+class InputRecorder:
+    """
+    Zeichnet alle Simulationsschritte einer Partie auf. Jeder Schritt wird als
+    "dt" bzw. "dt:Aktionen" kodiert, gleiche aufeinanderfolgende Schritte als
+    "Schritt*Anzahl" zusammengefasst. Zusammen mit dem Startwert der Partie
+    reicht das, um sie mit TetrisEngine exakt nachzuspielen.
+    """
+    def __init__(self, game, player_name=""):
+        self.seed = game.seed
+        self.width = game.width
+        self.height = game.height
+        self.randomizer = game.randomizer
+        self.player_name = player_name
+        self.date = datetime.now().strftime("%d.%m.%Y %H:%M")
+        self.tokens = []
+        self.last = None
+        self.repeat = 0
+        self.steps = 0
+
+    def record(self, actions, dt_ms):
+        token = str(dt_ms)
+        if actions:
+            token += ":" + "".join(ACTION_CODES[action] for action in actions)
+        self.steps += 1
+        if token == self.last:
+            self.repeat += 1
+        else:
+            self.flush()
+            self.last = token
+            self.repeat = 1
+
+    def flush(self):
+        if self.last is not None:
+            self.tokens.append(self.last if self.repeat == 1 else f"{self.last}*{self.repeat}")
+            self.last = None
+            self.repeat = 0
+
+    def to_dict(self, game):
+        """Aufzeichnung samt Endstand der Partie als Dictionary."""
+        self.flush()
+        return {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "width": self.width,
+            "height": self.height,
+            "randomizer": self.randomizer,
+            "player": self.player_name,
+            "date": self.date,
+            "steps": ",".join(self.tokens),
+            "result": {
+                "score": game.score,
+                "lines": game.lines_cleared,
+                "pieces": game.pieces_locked,
+                "game_over": game.game_over,
+            },
+        }
+
+    def save(self, game, directory=REPLAY_DIR):
+        """
+        Speichert die Aufzeichnung als JSON-Datei in directory. Geschrieben
+        wird in einem Hintergrund-Thread (siehe write), damit das Game Over
+        die Spielschleife nicht aufhält. Gibt den Pfad der künftigen Datei zurück.
+        """
+        name = f"tetris_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.seed}.json"
+        path = os.path.join(directory, name)
+        # Kein Daemon-Thread: Python wartet beim Beenden, bis die Datei geschrieben ist
+        threading.Thread(target=self.write, args=(path, self.to_dict(game), directory),
+                         name="replay").start()
+        return path
+
+    def write(self, path, data, directory):
+        """
+        Schreibt data atomar nach path und löscht die ältesten Aufzeichnungen
+        über REPLAY_KEEP hinaus.
+        """
+        try:
+            os.makedirs(directory, exist_ok=True)
+            write_json_atomic(path, data, separators=(",", ":"))
+            replays = sorted(f for f in os.listdir(directory) if f.endswith(".json"))
+            for old in replays[:-REPLAY_KEEP]:
+                os.remove(os.path.join(directory, old))
+            print(f"Aufzeichnung gespeichert: {path}")
+        except Exception as e:
+            print(f"Fehler beim Speichern der Aufzeichnung: {e}")
+
+
+def load_replay(path):
+    """Lädt eine Aufzeichnung aus einer JSON-Datei."""
+    with open(path, "r") as file:
+        replay = json.load(file)
+    if replay.get("version") != REPLAY_VERSION:
+        raise ValueError(f"Unbekannte Version der Aufzeichnung: {replay.get('version')}")
+    return replay
+
+
+def decode_steps(text):
+    """Erzeugt die aufgezeichneten Schritte als (Aktionen, dt in ms)."""
+    if not text:
+        return
+    for token in text.split(","):
+        step, _, repeat = token.partition("*")
+        dt, _, codes = step.partition(":")
+        actions = [CODE_ACTIONS[code] for code in codes]
+        # Feste Ticks sind Bruchteile von Millisekunden (z. B. 1000 / 240)
+        dt = float(dt) if "." in dt else int(dt)
+        for _ in range(int(repeat or 1)):
+            yield actions, dt
+
+
+def replay_engine(replay):
+    """
+    Neue Spiellogik mit Startwert, Spielfeldgröße und Zufallsgenerator der
+    Aufzeichnung. Ältere Aufzeichnungen ohne Angabe stammen vom "uniform"-Generator.
+    """
+    return TetrisEngine(replay["width"], replay["height"], seed=replay["seed"],
+                        randomizer=replay.get("randomizer", "uniform"))
+
+
+def check_result(replay, game):
+    """Vergleicht den Endstand einer nachgespielten Partie mit der Aufzeichnung."""
+    result = replay["result"]
+    return (game.score == result["score"] and game.lines_cleared == result["lines"]
+            and game.pieces_locked == result["pieces"] and game.game_over == result["game_over"])
+
+
+def run_replay(replay):
+    """
+    Spielt eine Aufzeichnung so schnell wie möglich ohne Oberfläche nach.
+    Gibt (Spiellogik, Liste der Schrittzeiten in Sekunden) zurück.
+    """
+    game = replay_engine(replay)
+    timings = []
+    for actions, dt in decode_steps(replay["steps"]):
+        start = time.perf_counter()
+        game.step(actions, dt)
+        timings.append(time.perf_counter() - start)
+    return game, timings
+
+
+def percentile(values, fraction):
+    """Wert, unter dem der Anteil fraction der (sortierten) Werte liegt."""
+    if not values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(values)) - 1)
+    return values[index]
+
+
+def timing_summary(timings):
+    """Kurzfassung einer Liste von Zeiten in Sekunden: Durchschnitt, p95, p99, Maximum."""
+    values = sorted(timings)
+    average = sum(values) / len(values) if values else 0.0
+    return (f"Ø {average * 1000:.3f} ms, p95 {percentile(values, 0.95) * 1000:.3f} ms, "
+            f"p99 {percentile(values, 0.99) * 1000:.3f} ms, "
+            f"max {(values[-1] if values else 0.0) * 1000:.3f} ms")
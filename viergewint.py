@@ -1,9 +1,12 @@
 import pygame
 import sys
-import math
+import os
+import json
 import random
 import time
 import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Versuche, numpy zu importieren – andernfalls wird eine Fehlermeldung ausgegeben.
 try:
@@ -12,6 +15,11 @@ except ImportError:
     print("Numpy wird benötigt. Bitte installiere es mit: pip install numpy")
     sys.exit(1)
 
+from viergewint_engine import (
+    ROW_COUNT, COLUMN_COUNT, CONNECT_COUNT, SOLVER_EMPTY_CELLS, Position, TranspositionTable,
+    check_win_at, choose_move, ponder, TIME_BUDGETS_MS, ParallelSearch, load_opening_book,
+)
+
 # Farben werden definiert.
 BLUE = (0, 0, 255)
 DARK_BLUE = (0, 0, 180)
@@ -27,12 +35,72 @@ LIGHT_BLUE = (100, 100, 255)
 GREEN = (0, 200, 0)
 LIGHT_RED = (255, 100, 100)  # Farbe für den Beenden-Button
 
-# Spielfeldkonstanten: 6 Zeilen und 7 Spalten
-ROW_COUNT = 6
-COLUMN_COUNT = 7
+# Mindestdauer eines KI-Zugs in Millisekunden (kurze Verzögerung für visuelle Effekte)
+AI_MIN_DELAY_MS = 300
+
+# Anzahl der Prozesse für die parallele Suche im "Unschlagbar"-Modus.
+# Einstellbar über "vier_gewinnt_ai_workers" in config.json; ohne Eintrag
+# bleibt ein Kern für die Benutzeroberfläche frei. 1 = keine Prozesse.
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+
+def load_ai_workers():
+    """Liest die Anzahl der KI-Prozesse aus config.json."""
+    default = max(1, (os.cpu_count() or 1) - 1)
+    try:
+        with open(CONFIG_PATH, "r") as file:
+            return max(1, int(json.load(file).get("vier_gewinnt_ai_workers", default)))
+    except (OSError, ValueError, AttributeError):
+        return default
+
+
+AI_WORKERS = load_ai_workers()
+
+
+# Ab wie vielen freien Feldern "Unschlagbar" das Endspiel exakt löst.
+# Einstellbar über "vier_gewinnt_solver_cells" in config.json; 0 = nie.
+def load_solver_cells():
+    """Liest die Schwelle für den Endspiel-Löser aus config.json."""
+    try:
+        with open(CONFIG_PATH, "r") as file:
+            return max(0, int(json.load(file).get("vier_gewinnt_solver_cells",
+                                                  SOLVER_EMPTY_CELLS)))
+    except (OSError, ValueError, AttributeError):
+        return SOLVER_EMPTY_CELLS
+
+
+SOLVER_CELLS = load_solver_cells()
+
+# Bildrate während Animationen bzw. Eingaben und im Leerlauf (nur Warten auf Eingaben)
+ACTIVE_FPS = 120
+IDLE_FPS = 10
+# True = nur geänderte Bildbereiche an den Bildschirm übertragen
+DIRTY_RECTS = True
+
+# SysFont-Objekte sind teuer in der Erzeugung – je Größe nur einmal anlegen
+_font_cache = {}
+
+
+def get_font(size, bold=False):
+    """Gibt die (zwischengespeicherte) Arial-Schrift in der Größe zurück."""
+    font = _font_cache.get((size, bold))
+    if font is None:
+        font = pygame.font.SysFont("Arial", size, bold=bold)
+        _font_cache[(size, bold)] = font
+    return font
+
+# Wählbare Spielfelder: (Zeilen, Spalten, Steine in einer Reihe zum Sieg)
+BOARD_VARIANTS = [
+    (ROW_COUNT, COLUMN_COUNT, CONNECT_COUNT),
+    (7, 8, 4),
+    (8, 9, 5),
+    (9, 10, 5),
+]
+CONNECT_NAMES = {3: "Drei", 4: "Vier", 5: "Fünf", 6: "Sechs"}
 
 # Basiswerte für das Skalieren des Spielfelds
 BASE_CELL_SIZE = 100  # Basis-Zellgröße, dient als Referenz für den Skalierungsfaktor
+MENU_BUTTON_COUNT = 9  # Spielmodus, Schwierigkeit, Spielfeld, Neustart und Beenden
 MENU_RATIO = 0.30     # Verhältnis vom Menü zur Gesamtbreite
 
 # -----------------------------------------------------------------------------
@@ -53,7 +121,7 @@ class Button:
     def draw(self, screen, scale_factor=1.0):
         # Berechne die skalierte Schriftgröße
         font_size = int(self.base_font_size * scale_factor)
-        font = pygame.font.SysFont("Arial", font_size)
+        font = get_font(font_size)
 
         # Farbe des Buttons ändert sich abhängig von Aktivität oder Hover-Status
         if self.active:
@@ -113,9 +181,9 @@ class Button:
 # -----------------------------------------------------------------------------
 class GameUI:
     def __init__(self):
-        # Spielfeld-Konstanten: Anzahl Zeilen und Spalten
-        self.row_count = ROW_COUNT
-        self.column_count = COLUMN_COUNT
+        # Spielfeldgröße und Anzahl Steine in einer Reihe (siehe BOARD_VARIANTS)
+        self.board_variant = 0
+        self.row_count, self.column_count, self.connect_count = BOARD_VARIANTS[0]
         self.board = self.create_board()
 
         # Spielvariablen
@@ -129,6 +197,31 @@ class GameUI:
         self.falling_chip = None  # Wird genutzt, falls ein Chip animiert fällt
         self.hover_col = None     # Spalte für Vorschau-Anzeige beim Schweben der Maus
 
+        # Transpositionstabelle der KI – bleibt über alle KI-Züge eines Spiels erhalten
+        self.transposition_table = TranspositionTable()
+        # Vorberechnete Eröffnungszüge (viergewint_book.py), falls vorhanden
+        self.opening_book = load_opening_book()
+
+        # Die KI rechnet in einem Hintergrund-Thread, damit die Hauptschleife
+        # weiter zeichnet. ai_future ist der laufende Auftrag, ai_stop bricht ihn ab.
+        self.ai_executor = ThreadPoolExecutor(max_workers=1)
+        self.ai_future = None
+        self.ai_stop = None
+        self.ai_start_time = 0
+
+        # Vorausdenken während des Spielerzugs (im selben Hintergrund-Thread).
+        # ponder_results: Hash der Stellung nach dem Spielerzug -> Antwort der KI
+        self.ponder_future = None
+        self.ponder_stop = None
+        self.ponder_results = {}
+
+        # Prozess-Pool für "Unschlagbar" – wird schon jetzt gestartet, damit
+        # der erste Zug nicht auf das Starten der Prozesse warten muss.
+        self.parallel_search = None
+        if AI_WORKERS > 1:
+            self.parallel_search = ParallelSearch(AI_WORKERS)
+            self.parallel_search.warm_up()
+
         # Initialisiere pygame und setze den Bildschirm
         pygame.init()
 
@@ -148,6 +241,8 @@ class GameUI:
 
         # Für konstante Framerate
         self.clock = pygame.time.Clock()
+        # Zustand der Bildbereiche beim letzten Zeichnen (siehe dirty_rects)
+        self.last_render_state = None
 
     def calculate_sizes(self):
         """Berechnet alle benötigten Größen und Positionen anhand der aktuellen Bildschirmgröße."""
@@ -162,8 +257,11 @@ class GameUI:
         self.cell_size_height = self.height // (self.row_count + 1)
         self.cell_size = min(self.cell_size_width, self.cell_size_height)
 
-        # Berechne den Skalierungsfaktor relativ zur BASE_CELL_SIZE
-        self.scale_factor = max(0.5, self.cell_size / BASE_CELL_SIZE)
+        # Berechne den Skalierungsfaktor relativ zur BASE_CELL_SIZE. Er richtet
+        # sich nach dem Standardfeld, damit das Menü bei großen Feldern nicht schrumpft.
+        standard_cell_size = min(self.game_width // COLUMN_COUNT,
+                                 self.height // (ROW_COUNT + 1))
+        self.scale_factor = max(0.5, standard_cell_size / BASE_CELL_SIZE)
 
         # Radius der Spielsteine (kugelförmig)
         self.chip_radius = int(self.cell_size * 0.4)
@@ -181,14 +279,82 @@ class GameUI:
                                       self.row_count * self.cell_size)
         self.menu_rect = pygame.Rect(self.menu_start_x, 0, self.menu_width, self.height)
 
-    def init_buttons(self):
-        """Initialisiert alle Buttons der Benutzeroberfläche (ohne Vollbild-Button)."""
-        # Berechne die Basiswerte für Button-Größen und Positionen
+        # Statische Grafiken passend zur neuen Größe vorab zeichnen
+        self.build_surfaces()
+
+    def build_surfaces(self):
+        """
+        Zeichnet das Spielfeld (Rahmen, Zellen, Löcher) und die Spielsteine
+        beider Spieler (mit Schatten und Glanzeffekt) einmalig auf eigene
+        Surfaces. draw() setzt jedes Frame nur noch aus diesen Bildern zusammen.
+        """
+        # Spielfeld: Rahmen und blaue Zellen mit schwarzem Kreis als "Loch"
+        self.board_surface = pygame.Surface(self.board_rect.size)
+        self.board_surface.fill(BLACK)
+        pygame.draw.rect(self.board_surface, DARK_BLUE, self.board_surface.get_rect(),
+                         border_radius=15)
+        for c in range(self.column_count):
+            for r in range(self.row_count):
+                rect_x = c * self.cell_size
+                rect_y = r * self.cell_size
+                pygame.draw.rect(self.board_surface, BLUE,
+                                 (rect_x, rect_y, self.cell_size, self.cell_size))
+                pygame.draw.circle(self.board_surface, BLACK,
+                                   (rect_x + self.cell_size // 2,
+                                    rect_y + self.cell_size // 2),
+                                   self.chip_radius)
+
+        # Spielsteine: Mittelpunkt bei (chip_offset, chip_offset) im Sprite,
+        # darum herum Platz für den um 3 Pixel versetzten Schatten
+        radius = self.chip_radius
+        self.chip_offset = radius + 1
+        sprite_size = 2 * radius + 5
+        highlight_size = radius // 2
+        highlight_surf = pygame.Surface((highlight_size, highlight_size), pygame.SRCALPHA)
+        pygame.draw.circle(highlight_surf, (255, 255, 255, 100),
+                           (highlight_size // 2, highlight_size // 2),
+                           highlight_size // 2)
+        self.chip_sprites = {}
+        self.preview_sprites = {}
+        for player, color, shadow_color in ((1, RED, DARK_RED), (2, YELLOW, DARK_YELLOW)):
+            sprite = pygame.Surface((sprite_size, sprite_size), pygame.SRCALPHA)
+            center = self.chip_offset
+            pygame.draw.circle(sprite, shadow_color, (center + 3, center + 3), radius)
+            pygame.draw.circle(sprite, color, (center, center), radius)
+            sprite.blit(highlight_surf, (center - highlight_size // 2,
+                                         center - highlight_size // 2))
+            self.chip_sprites[player] = sprite
+
+            # Halbtransparente Vorschau auf dem Zielfeld
+            preview = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(preview, (color[0], color[1], color[2], 100),
+                               (radius, radius), radius)
+            self.preview_sprites[player] = preview
+
+    def draw_chip(self, player, center_x, center_y):
+        """Zeichnet den vorbereiteten Spielstein von player mit Mittelpunkt (center_x, center_y)."""
+        self.screen.blit(self.chip_sprites[player],
+                         (center_x - self.chip_offset, center_y - self.chip_offset))
+
+    def calculate_button_layout(self, count):
+        """
+        Berechnet Größe und Abstand der Menü-Buttons. Der Abstand richtet sich
+        nach der Höhe, die unter dem Spielstand bis zum unteren Rand bleibt,
+        damit alle count Buttons auch auf breiten, niedrigen Bildschirmen
+        (z. B. 16:9) vollständig sichtbar sind.
+        """
         self.button_width = int(min(220, self.menu_width * 0.85) * self.scale_factor)
-        self.button_height = int(50 * self.scale_factor)
-        self.button_spacing = int(60 * self.scale_factor)
         self.button_x = self.menu_start_x + (self.menu_width - self.button_width) // 2
         self.button_start_y = int(200 * self.scale_factor)
+        bottom_margin = int(20 * self.scale_factor)
+        available = self.height - self.button_start_y - bottom_margin
+        self.button_spacing = min(int(60 * self.scale_factor), available // count)
+        self.button_height = min(int(50 * self.scale_factor), self.button_spacing * 5 // 6)
+
+    def init_buttons(self):
+        """Initialisiert alle Buttons der Benutzeroberfläche (ohne Vollbild-Button)."""
+        # Berechne die Basiswerte für Button-Größen und Positionen
+        self.calculate_button_layout(MENU_BUTTON_COUNT)
 
         # Spielmodus-Buttons:
         self.koop_button = Button(self.button_x, self.button_start_y,
@@ -221,15 +387,21 @@ class GameUI:
                                         self.button_width, self.button_height,
                                         "Unschlagbar", GRAY, WHITE)
 
+        # Spielfeld-Button: wechselt reihum durch BOARD_VARIANTS
+        self.board_button = Button(self.button_x,
+                                   self.button_start_y + self.button_spacing * 6,
+                                   self.button_width, self.button_height,
+                                   self.board_variant_label(), GRAY, WHITE)
+
         # Reset-Button (zum Neustarten des Spiels)
         self.reset_button = Button(self.button_x,
-                                   self.button_start_y + self.button_spacing * 6,
+                                   self.button_start_y + self.button_spacing * 7,
                                    self.button_width, self.button_height,
                                    "Spiel neu starten", GRAY, WHITE)
 
         # Beenden-Button (um das Spiel zu beenden)
         self.exit_button = Button(self.button_x,
-                                  self.button_start_y + self.button_spacing * 7,
+                                  self.button_start_y + self.button_spacing * 8,
                                   self.button_width, self.button_height,
                                   "Spiel beenden", LIGHT_RED, WHITE, WHITE)
 
@@ -241,26 +413,26 @@ class GameUI:
         ]
         self.all_buttons = ([self.koop_button, self.ai_button]
                             + self.difficulty_buttons
-                            + [self.reset_button, self.exit_button])
+                            + [self.board_button, self.reset_button, self.exit_button])
 
     def update_ui_positions(self):
         """Aktualisiert alle UI-Elemente nach einer Größenänderung."""
         self.calculate_sizes()
-
-        self.button_width = int(min(220, self.menu_width * 0.85) * self.scale_factor)
-        self.button_height = int(50 * self.scale_factor)
-        self.button_spacing = int(60 * self.scale_factor)
-        self.button_x = self.menu_start_x + (self.menu_width - self.button_width) // 2
-        self.button_start_y = int(200 * self.scale_factor)
+        self.calculate_button_layout(len(self.all_buttons))
 
         # Aktualisiere Position und Größe aller Buttons gemäß dem neuen Skalierungsfaktor.
+        # Erst die Größe (set_size behält den Mittelpunkt), dann die Position.
         for i, button in enumerate(self.all_buttons):
+            button.set_size(self.button_width, self.button_height)
             button.set_position(self.button_x,
                                 self.button_start_y + i * self.button_spacing)
-            button.set_size(self.button_width, self.button_height)
 
     def exit_game(self):
         """Beendet das Spiel vollständig."""
+        self.cancel_ai_move()
+        self.ai_executor.shutdown(wait=False, cancel_futures=True)
+        if self.parallel_search is not None:
+            self.parallel_search.shutdown()
         pygame.quit()
         sys.exit()
 
@@ -286,33 +458,12 @@ class GameUI:
                 return r
         return -1
 
-    def winning_move(self, piece):
-        """Prüft, ob der übergebene Spielstein (piece) vier in einer Reihe hat."""
-        # Horizontale Überprüfung:
-        for c in range(self.column_count - 3):
-            for r in range(self.row_count):
-                if all(self.board[r][c + i] == piece for i in range(4)):
-                    return True
-
-        # Vertikale Überprüfung:
-        for c in range(self.column_count):
-            for r in range(self.row_count - 3):
-                if all(self.board[r + i][c] == piece for i in range(4)):
-                    return True
-
-        # Positive diagonale Überprüfung (\):
-        for c in range(self.column_count - 3):
-            for r in range(self.row_count - 3):
-                if all(self.board[r + i][c + i] == piece for i in range(4)):
-                    return True
-
-        # Negative diagonale Überprüfung (/):
-        for c in range(self.column_count - 3):
-            for r in range(3, self.row_count):
-                if all(self.board[r - i][c + i] == piece for i in range(4)):
-                    return True
-
-        return False
+    def winning_move_at(self, row, col, piece):
+        """
+        Prüft nur die vier Richtungen durch den zuletzt gesetzten Stein (row, col).
+        Nach einem Zug reicht das, da sich nur dort eine Reihe geändert haben kann.
+        """
+        return check_win_at(self.board, row, col, piece, self.connect_count)
 
     def is_board_full(self):
         """Gibt True zurück, wenn keine leere Zelle mehr vorhanden ist."""
@@ -326,6 +477,12 @@ class GameUI:
         self.current_player = 1
         self.winner = None
         self.falling_chip = None
+        # Eine noch laufende KI-Suche gehört zum alten Spiel
+        self.cancel_ai_move()
+        # Gespeicherte Bewertungen gelten nur für das laufende Spiel. Eine neue
+        # Tabelle statt clear(), da eine abgebrochene Suche noch kurz hineinschreiben kann.
+        self.transposition_table = TranspositionTable()
+        self.ponder_results = {}
 
     def start_chip_animation(self, col, player):
         """
@@ -369,7 +526,7 @@ class GameUI:
             # Nach einigen Abprallern wird der Chip festgesetzt.
             if chip["bounces"] > 2 or abs(chip["velocity"]) < 1:
                 self.drop_piece(chip["row"], chip["col"], chip["player"])
-                if self.winning_move(chip["player"]):
+                if self.winning_move_at(chip["row"], chip["col"], chip["player"]):
                     self.winner = chip["player"]
                     self.game_over = True
                     if chip["player"] == 1:
@@ -388,338 +545,94 @@ class GameUI:
 
         return False
 
-    def evaluate_window(self, window, piece):
+    def compute_ai_move(self, pos, difficulty, table, stop=None, pondered=None):
         """
-        Bewertet ein Fenster (Liste von 4 Zellen) für die KI.
-        Je nachdem, wie viele gleiche Spielsteine (oder Gegner) im Fenster sind, wird ein Wert zurückgegeben.
+        Berechnet den Zug der KI für die Position und gibt die Spalte zurück
+        (Strategien je Schwierigkeitsgrad: siehe viergewint_engine.choose_move).
+        Läuft im Hintergrund-Thread und liest deshalb keinen veränderlichen
+        Spielzustand von self, sondern nur die übergebenen Werte.
         """
-        opponent = 1 if piece == 2 else 2
-
-        if window.count(piece) == 4:
-            return 100
-        elif window.count(piece) == 3 and window.count(0) == 1:
-            return 10
-        elif window.count(piece) == 2 and window.count(0) == 2:
-            return 2
+        return choose_move(pos, difficulty, table, stop, self.parallel_search,
+                           self.opening_book, verbose=True, solver_cells=SOLVER_CELLS,
+                           pondered=pondered)
 
-        if window.count(opponent) == 3 and window.count(0) == 1:
-            return -80
-        elif (window.count(opponent) == 2 and window.count(0) == 2 and
-              self.difficulty == "Unschlagbar"):
-            return -3
-
-        return 0
-
-    def score_position(self, board, piece):
+    def ai_make_move(self):
         """
-        Bewertet die gesamte Brettposition für den Spieler (piece) unter Anwendung verschiedener Strategien.
-        Dazu gehören:
-          - Gewichtung der zentralen Spalte,
-          - horizontale, vertikale und diagonale Anordnungen,
-          - Vermeiden von "Trap"-Situationen.
+        Startet die Zugberechnung der KI im Hintergrund. Das Ergebnis wird in
+        poll_ai_move abgeholt, damit die Hauptschleife weiter zeichnet und
+        auf Eingaben reagiert, während die KI nachdenkt.
         """
-        score = 0
-        opponent = 1 if piece == 2 else 2
-
-        # Starke Gewichtung der mittleren Spalte
-        center_column = self.column_count // 2
-        center_array = [int(i) for i in list(board[:, center_column])]
-        center_count = center_array.count(piece)
-        score += center_count * 6
-
-        # Horizontale Bewertung
-        for r in range(self.row_count):
-            row_array = [int(i) for i in list(board[r, :])]
-            for c in range(self.column_count - 3):
-                window = row_array[c : c + 4]
-                score += self.evaluate_window(window, piece)
-
-        # Vertikale Bewertung mit etwas höherer Gewichtung
-        for c in range(self.column_count):
-            col_array = [int(i) for i in list(board[:, c])]
-            for r in range(self.row_count - 3):
-                window = col_array[r : r + 4]
-                score += self.evaluate_window(window, piece) * 1.2
-
-        # Positive Diagonale (\)
-        for r in range(self.row_count - 3):
-            for c in range(self.column_count - 3):
-                window = [board[r + i][c + i] for i in range(4)]
-                score += self.evaluate_window(window, piece) * 1.1
-
-        # Negative Diagonale (/)
-        for r in range(3, self.row_count):
-            for c in range(self.column_count - 3):
-                window = [board[r - i][c + i] for i in range(4)]
-                score += self.evaluate_window(window, piece) * 1.1
-
-        # Prüfe zusätzliche Bedrohungen im "Unschlagbar"-Modus
-        if self.difficulty == "Unschlagbar":
-            for c in range(self.column_count):
-                for r in range(self.row_count):
-                    if board[r][c] == 0:
-                        if r == 0 or board[r - 1][c] != 0:
-                            b_copy = board.copy()
-                            b_copy[r][c] = opponent
-                            win_threats = 0
-                            for test_col in range(self.column_count):
-                                if self.get_next_open_row_for_board(b_copy, test_col) != -1:
-                                    test_row = self.get_next_open_row_for_board(b_copy, test_col)
-                                    test_board = b_copy.copy()
-                                    test_board[test_row][test_col] = opponent
-                                    if self.check_win_on_board(test_board, opponent):
-                                        win_threats += 1
-                            if win_threats >= 2:
-                                score -= 100
-
-        return score
-
-    def get_next_open_row_for_board(self, board, col):
-        """Ermittelt die nächste freie Zeile für ein gegebenes Board (wird in der KI genutzt)."""
-        col = int(col)
-        for r in range(self.row_count):
-            if board[r][col] == 0:
-                return r
-        return -1
-
-    def check_win_on_board(self, board, piece):
-        """Prüft, ob ein Spieler (piece) auf einem bestimmten Board gewonnen hat."""
-        for c in range(self.column_count - 3):
-            for r in range(self.row_count):
-                if all(board[r][c + i] == piece for i in range(4)):
-                    return True
-
-        for c in range(self.column_count):
-            for r in range(self.row_count - 3):
-                if all(board[r + i][c] == piece for i in range(4)):
-                    return True
-
-        for c in range(self.column_count - 3):
-            for r in range(self.row_count - 3):
-                if all(board[r + i][c + i] == piece for i in range(4)):
-                    return True
-
-        for c in range(self.column_count - 3):
-            for r in range(3, self.row_count):
-                if all(board[r - i][c + i] == piece for i in range(4)):
-                    return True
-
-        return False
+        if self.game_mode != "ai" or self.current_player != 2 or self.game_over:
+            return
+        if self.ai_future is not None:
+            return
 
-    def minimax(self, board, depth, alpha, beta, maximizing_player):
-        """
-        Führt den verbesserten Minimax-Algorithmus mit Alpha-Beta-Pruning aus.
-        Diese Methode ermittelt den optimalen Zug für die KI.
-        """
-        try:
-            valid_locations = [
-                c
-                for c in range(self.column_count)
-                if self.get_next_open_row_for_board(board, c) != -1
-            ]
-
-            # Begrenze die Tiefe für Performancezwecke
-            if depth > 5:
-                depth = 5
-
-            # Endzustände prüfen
-            if self.check_win_on_board(board, 2):
-                return (None, 1000000 + depth)
-            elif self.check_win_on_board(board, 1):
-                return (None, -1000000 - depth)
-            elif len(valid_locations) == 0 or depth == 0:
-                return (None, self.score_position(board, 2))
-
-            # Sortiere die gültigen Spalten, sodass die mittleren Spalten zuerst geprüft werden.
-            middle = self.column_count // 2
-            valid_locations.sort(key=lambda x: abs(x - middle))
-
-            if maximizing_player:
-                value = -math.inf
-                column = valid_locations[0] if valid_locations else None
-
-                for col in valid_locations:
-                    row = self.get_next_open_row_for_board(board, col)
-                    if row == -1:
-                        continue
-
-                    b_copy = board.copy()
-                    b_copy[row][col] = 2
-
-                    if self.check_win_on_board(b_copy, 2):
-                        return (col, 1000000 + depth)
-
-                    new_score = self.minimax(b_copy, depth - 1, alpha, beta, False)[1]
-                    if new_score > value:
-                        value = new_score
-                        column = col
-                    alpha = max(alpha, value)
-                    if alpha >= beta:
-                        break
-
-                return column, value
-            else:
-                value = math.inf
-                column = valid_locations[0] if valid_locations else None
-
-                for col in valid_locations:
-                    row = self.get_next_open_row_for_board(board, col)
-                    if row == -1:
-                        continue
-
-                    b_copy = board.copy()
-                    b_copy[row][col] = 1
-
-                    new_score = self.minimax(b_copy, depth - 1, alpha, beta, True)[1]
-                    if new_score < value:
-                        value = new_score
-                        column = col
-                    beta = min(beta, value)
-                    if alpha >= beta:
-                        break
-
-                return column, value
-        except Exception as e:
-            print(f"Fehler im Minimax: {e}")
-            if valid_locations:
-                return random.choice(valid_locations), 0
-            return None, 0
+        # Vorausdenken beenden; der Auftrag der KI startet, sobald der Thread frei ist
+        self.stop_pondering()
+        pos = Position.from_board(self.board, self.connect_count)
+        self.ai_stop = threading.Event()
+        self.ai_start_time = pygame.time.get_ticks()
+        self.ai_future = self.ai_executor.submit(
+            self.compute_ai_move, pos, self.difficulty,
+            self.transposition_table, self.ai_stop, self.ponder_results)
 
-    def ai_make_move(self):
+    def poll_ai_move(self):
         """
-        Lässt die KI einen Zug berechnen und ausführen.
-        Hier werden je nach Schwierigkeitsgrad verschiedene Strategien angewandt.
+        Wird in jedem Frame aufgerufen: Ist die KI fertig (und die kurze
+        Verzögerung für visuelle Effekte vorbei), fällt ihr Spielstein.
         """
-        if self.game_mode != "ai" or self.current_player != 2 or self.game_over:
+        if self.ai_future is None or not self.ai_future.done():
+            return
+        if pygame.time.get_ticks() - self.ai_start_time < AI_MIN_DELAY_MS:
             return
 
-        # Kurze Verzögerung für visuelle Effekte
-        pygame.time.delay(300)
-
+        future = self.ai_future
+        self.ai_future = None
         try:
+            col = future.result()
+        except Exception as e:
+            print(f"Fehler beim KI-Zug: {e}")
+            col = None
+
+        if col is None or not self.is_valid_location(col):
             valid_columns = [c for c in range(self.column_count)
                              if self.is_valid_location(c)]
             if not valid_columns:
                 return
+            col = random.choice(valid_columns)
+        self.start_chip_animation(col, 2)
 
-            # Leichter Schwierigkeitsgrad: Mischung aus intelligenten und zufälligen Zügen.
-            if self.difficulty == "Leicht":
-                if random.random() > 0.4:
-                    for col in valid_columns:
-                        row = self.get_next_open_row(col)
-                        temp_board = self.board.copy()
-                        temp_board[row][col] = 2
-                        if self.check_win_on_board(temp_board, 2):
-                            self.start_chip_animation(col, 2)
-                            return
-
-                    if random.random() > 0.3:
-                        for col in valid_columns:
-                            row = self.get_next_open_row(col)
-                            temp_board = self.board.copy()
-                            temp_board[row][col] = 1
-                            if self.check_win_on_board(temp_board, 1):
-                                self.start_chip_animation(col, 2)
-                                return
-
-                col = random.choice(valid_columns)
-                self.start_chip_animation(col, 2)
-            # Mittlerer Schwierigkeitsgrad: Gewinne praktikabel selbst prüfen und blockieren.
-            elif self.difficulty == "Mittel":
-                for col in valid_columns:
-                    row = self.get_next_open_row(col)
-                    temp_board = self.board.copy()
-                    temp_board[row][col] = 2
-                    if self.check_win_on_board(temp_board, 2):
-                        self.start_chip_animation(col, 2)
-                        return
-
-                for col in valid_columns:
-                    row = self.get_next_open_row(col)
-                    temp_board = self.board.copy()
-                    temp_board[row][col] = 1
-                    if self.check_win_on_board(temp_board, 1):
-                        self.start_chip_animation(col, 2)
-                        return
-
-                center_columns = [c for c in valid_columns
-                                  if c >= self.column_count // 3 and
-                                  c <= 2 * self.column_count // 3]
-                if center_columns:
-                    col = random.choice(center_columns)
-                else:
-                    col = random.choice(valid_columns)
-                self.start_chip_animation(col, 2)
-            # Schwerer Schwierigkeitsgrad: Mischung aus Gewinnprüfungen und Minimax.
-            elif self.difficulty == "Schwer":
-                for col in valid_columns:
-                    row = self.get_next_open_row(col)
-                    temp_board = self.board.copy()
-                    temp_board[row][col] = 2
-                    if self.check_win_on_board(temp_board, 2):
-                        self.start_chip_animation(col, 2)
-                        return
-
-                for col in valid_columns:
-                    row = self.get_next_open_row(col)
-                    temp_board = self.board.copy()
-                    temp_board[row][col] = 1
-                    if self.check_win_on_board(temp_board, 1):
-                        self.start_chip_animation(col, 2)
-                        return
-
-                col, _ = self.minimax(self.board.copy(), 3, -math.inf,
-                                      math.inf, True)
-                if col is not None:
-                    self.start_chip_animation(col, 2)
-                else:
-                    self.start_chip_animation(random.choice(valid_columns), 2)
-            # Unschlagbar: höchste Priorität für Gewinne und Blockaden,
-            # ggf. mit verschiedener Suchtiefe je nach Spielphase.
-            elif self.difficulty == "Unschlagbar":
-                for col in valid_columns:
-                    row = self.get_next_open_row(col)
-                    temp_board = self.board.copy()
-                    temp_board[row][col] = 2
-                    if self.check_win_on_board(temp_board, 2):
-                        self.start_chip_animation(col, 2)
-                        return
-
-                for col in valid_columns:
-                    row = self.get_next_open_row(col)
-                    temp_board = self.board.copy()
-                    temp_board[row][col] = 1
-                    if self.check_win_on_board(temp_board, 1):
-                        self.start_chip_animation(col, 2)
-                        return
-
-                move_count = np.count_nonzero(self.board)
-                if move_count < 10:
-                    depth = 5
-                elif move_count < 25:
-                    depth = 4
-                else:
-                    depth = 3
+    def cancel_ai_move(self):
+        """Bricht eine laufende KI-Suche ab (z.B. bei Neustart oder Beenden)."""
+        self.stop_pondering()
+        if self.ai_future is not None:
+            self.ai_stop.set()
+            self.ai_future = None
 
-                col, _ = self.minimax(self.board.copy(), depth,
-                                      -math.inf, math.inf, True)
-                if col is not None and self.is_valid_location(col):
-                    self.start_chip_animation(col, 2)
-                else:
-                    center_columns = [c for c in valid_columns
-                                      if abs(c - self.column_count // 2) <= 1]
-                    if center_columns:
-                        self.start_chip_animation(random.choice(center_columns), 2)
-                    else:
-                        self.start_chip_animation(random.choice(valid_columns), 2)
-            else:
-                self.start_chip_animation(random.choice(valid_columns), 2)
-        except Exception as e:
-            print(f"Fehler beim KI-Zug: {e}")
-            valid_columns = [c for c in range(self.column_count)
-                             if self.is_valid_location(c)]
-            if valid_columns:
-                self.start_chip_animation(random.choice(valid_columns), 2)
+    def update_pondering(self):
+        """
+        Wird in jedem Frame aufgerufen: Ist im KI-Modus der Spieler am Zug,
+        sucht die KI im Hintergrund schon die Antworten auf alle seine
+        möglichen Züge (siehe viergewint_engine.ponder).
+        """
+        if (self.game_mode != "ai" or self.difficulty not in TIME_BUDGETS_MS
+                or self.current_player != 1 or self.game_over):
+            return
+        if self.ponder_future is not None or self.ai_future is not None:
+            return
+
+        pos = Position.from_board(self.board, self.connect_count)
+        self.ponder_stop = threading.Event()
+        self.ponder_future = self.ai_executor.submit(
+            ponder, pos, self.difficulty, self.transposition_table,
+            self.ponder_results, self.ponder_stop, self.parallel_search,
+            self.opening_book, SOLVER_CELLS, preferred=lambda: self.hover_col)
+
+    def stop_pondering(self):
+        """Beendet das Vorausdenken (Spielerzug gelandet, Neustart oder Beenden)."""
+        if self.ponder_future is not None:
+            self.ponder_stop.set()
+            self.ponder_future = None
 
     def draw(self):
         """
@@ -733,124 +646,37 @@ class GameUI:
         # Trennlinie zwischen Spielfeld und Menü
         pygame.draw.line(self.screen, WHITE, (self.menu_start_x, 0),
                          (self.menu_start_x, self.height), width=2)
-        # Spielfeldrahmen
-        pygame.draw.rect(self.screen, DARK_BLUE, self.board_rect,
-                         border_radius=15)
-
-        # Zeichne das Raster (blaue Zellen mit schwarzem Kreis als "Loch")
-        for c in range(self.column_count):
-            for r in range(self.row_count):
-                rect_x = self.board_offset_x + c * self.cell_size
-                rect_y = (r + 1) * self.cell_size
-                pygame.draw.rect(self.screen, BLUE,
-                                 (rect_x, rect_y, self.cell_size, self.cell_size))
-                pygame.draw.circle(self.screen, BLACK,
-                                   (rect_x + self.cell_size // 2,
-                                    rect_y + self.cell_size // 2),
-                                   self.chip_radius)
+        # Spielfeld (Rahmen, Zellen und Löcher) aus dem vorbereiteten Bild
+        self.screen.blit(self.board_surface, self.board_rect)
 
         # Zeichne die bereits abgelegten Spielsteine
         for c in range(self.column_count):
             for r in range(self.row_count):
-                center_x = (self.board_offset_x + c * self.cell_size +
-                            self.cell_size // 2)
-                center_y = ((self.row_count - r) * self.cell_size +
-                            self.cell_size // 2)
-                if self.board[r][c] == 1:
-                    # Erster Spieler (Rot) inkl. Schatten und Glanzeffekt
-                    pygame.draw.circle(self.screen, DARK_RED,
-                                       (center_x + 3, center_y + 3),
-                                       self.chip_radius)
-                    pygame.draw.circle(self.screen, RED,
-                                       (center_x, center_y), self.chip_radius)
-                    highlight_size = self.chip_radius // 2
-                    highlight_surf = pygame.Surface((highlight_size, highlight_size),
-                                                    pygame.SRCALPHA)
-                    pygame.draw.circle(highlight_surf, (255, 255, 255, 100),
-                                       (highlight_size // 2,
-                                        highlight_size // 2),
-                                       highlight_size // 2)
-                    self.screen.blit(highlight_surf,
-                                     (center_x - highlight_size // 2,
-                                      center_y - highlight_size // 2))
-                elif self.board[r][c] == 2:
-                    # Zweiter Spieler (Gelb/Computer) inkl. Schatten und Glanzeffekt
-                    pygame.draw.circle(self.screen, DARK_YELLOW,
-                                       (center_x + 3, center_y + 3),
-                                       self.chip_radius)
-                    pygame.draw.circle(self.screen, YELLOW,
-                                       (center_x, center_y), self.chip_radius)
-                    highlight_size = self.chip_radius // 2
-                    highlight_surf = pygame.Surface((highlight_size, highlight_size),
-                                                    pygame.SRCALPHA)
-                    pygame.draw.circle(highlight_surf, (255, 255, 255, 100),
-                                       (highlight_size // 2,
-                                        highlight_size // 2),
-                                       highlight_size // 2)
-                    self.screen.blit(highlight_surf,
-                                     (center_x - highlight_size // 2,
-                                      center_y - highlight_size // 2))
+                piece = self.board[r][c]
+                if piece:
+                    center_x = (self.board_offset_x + c * self.cell_size +
+                                self.cell_size // 2)
+                    center_y = ((self.row_count - r) * self.cell_size +
+                                self.cell_size // 2)
+                    self.draw_chip(int(piece), center_x, center_y)
 
         # Zeichne den fallenden Chip (während der Animation)
         if self.falling_chip:
             chip = self.falling_chip
-            color = RED if chip["player"] == 1 else YELLOW
-            shadow_color = DARK_RED if chip["player"] == 1 else DARK_YELLOW
-            pygame.draw.circle(self.screen, shadow_color,
-                               (chip["x"] + 3, chip["y"] + 3),
-                               self.chip_radius)
-            pygame.draw.circle(self.screen, color,
-                               (chip["x"], chip["y"]),
-                               self.chip_radius)
-            highlight_size = self.chip_radius // 2
-            highlight_surf = pygame.Surface((highlight_size, highlight_size),
-                                            pygame.SRCALPHA)
-            pygame.draw.circle(highlight_surf, (255, 255, 255, 100),
-                               (highlight_size // 2, highlight_size // 2),
-                               highlight_size // 2)
-            self.screen.blit(highlight_surf,
-                             (chip["x"] - highlight_size // 2,
-                              chip["y"] - highlight_size // 2))
+            self.draw_chip(chip["player"], chip["x"], chip["y"])
 
         # Falls das Spiel läuft und noch kein Chip animiert wird, 
         # wird die Vorschau des Spielsteins angezeigt:
-        if not self.game_over and self.game_mode and not self.falling_chip:
-            mouse_pos = pygame.mouse.get_pos()
-            if (self.board_offset_x <= mouse_pos[0] <
-                    self.board_offset_x + self.board_width):
-                rel_x = mouse_pos[0] - self.board_offset_x
-                col = int(rel_x // self.cell_size)
-                if 0 <= col < self.column_count:
-                    x_pos = self.board_offset_x + col * self.cell_size + self.cell_size // 2
-                    color = RED if self.current_player == 1 else YELLOW
-                    shadow_color = DARK_RED if self.current_player == 1 else DARK_YELLOW
-                    pygame.draw.circle(self.screen, shadow_color,
-                                       (x_pos + 3, self.cell_size // 2 + 3),
-                                       self.chip_radius)
-                    pygame.draw.circle(self.screen, color,
-                                       (x_pos, self.cell_size // 2),
-                                       self.chip_radius)
-                    highlight_size = self.chip_radius // 2
-                    highlight_surf = pygame.Surface((highlight_size, highlight_size),
-                                                    pygame.SRCALPHA)
-                    pygame.draw.circle(highlight_surf, (255, 255, 255, 100),
-                                       (highlight_size // 2, highlight_size // 2),
-                                       highlight_size // 2)
-                    self.screen.blit(highlight_surf,
-                                     (x_pos - highlight_size // 2,
-                                      self.cell_size // 2 - highlight_size // 2))
-                    row = self.get_next_open_row(col)
-                    if row != -1:
-                        preview_y = (self.row_count - row) * self.cell_size + self.cell_size // 2
-                        preview_surf = pygame.Surface((self.chip_radius * 2,
-                                                       self.chip_radius * 2),
-                                                      pygame.SRCALPHA)
-                        pygame.draw.circle(preview_surf, (color[0], color[1], color[2], 100),
-                                           (self.chip_radius, self.chip_radius),
-                                           self.chip_radius)
-                        self.screen.blit(preview_surf,
-                                         (x_pos - self.chip_radius,
-                                          preview_y - self.chip_radius))
+        col = self.preview_column()
+        if col is not None:
+            x_pos = self.board_offset_x + col * self.cell_size + self.cell_size // 2
+            self.draw_chip(self.current_player, x_pos, self.cell_size // 2)
+            row = self.get_next_open_row(col)
+            if row != -1:
+                preview_y = (self.row_count - row) * self.cell_size + self.cell_size // 2
+                self.screen.blit(self.preview_sprites[self.current_player],
+                                 (x_pos - self.chip_radius,
+                                  preview_y - self.chip_radius))
 
         # Menü und Buttons zeichnen
         self.draw_menu()
@@ -860,7 +686,81 @@ class GameUI:
         # Wird eine Gewinn- oder Unentschieden-Nachricht angezeigt?
         if self.game_over:
             self.draw_win_message()
-        pygame.display.update()
+
+    def preview_column(self):
+        """Spalte unter dem Mauszeiger, über der die Vorschau erscheint, sonst None."""
+        if self.game_over or not self.game_mode or self.falling_chip:
+            return None
+        mouse_x = pygame.mouse.get_pos()[0]
+        if not self.board_offset_x <= mouse_x < self.board_offset_x + self.board_width:
+            return None
+        col = int((mouse_x - self.board_offset_x) // self.cell_size)
+        return col if 0 <= col < self.column_count else None
+
+    def render_state(self):
+        """
+        Beschreibt jeden Bildbereich durch die Werte, von denen sein Inhalt
+        abhängt: {Schlüssel: (Zustand, Rechteck)}. Ändert sich der Zustand
+        "full" (Bildschirmgröße, Spielmodus, Spielende), wird alles neu gezeichnet.
+        """
+        state = {
+            "full": ((self.width, self.height, self.board_variant, self.game_mode,
+                      self.difficulty, self.game_over, self.winner), self.screen.get_rect()),
+            "score": ((self.score_player1, self.score_player2), self.menu_rect),
+        }
+        # Buttons samt Schatten
+        padding = 2 * max(4, int(4 * self.scale_factor))
+        for i, button in enumerate(self.all_buttons):
+            state[("button", i)] = ((button.is_hovered, button.active),
+                                    button.rect.inflate(padding, padding))
+        # Spalten des Spielfelds: Steine, fallender Chip und Vorschau
+        preview = self.preview_column()
+        chip = self.falling_chip
+        for c in range(self.column_count):
+            value = (tuple(self.board[:, c]),
+                     chip["y"] if chip and chip["col"] == c else None,
+                     self.current_player if preview == c else None)
+            # Etwas breiter als die Spalte, da der Schatten der Steine übersteht
+            rect = pygame.Rect(self.board_offset_x + c * self.cell_size - 4, 0,
+                               self.cell_size + 8, self.height)
+            state[("column", c)] = (value, rect)
+        return state
+
+    def dirty_rects(self):
+        """Gibt die Rechtecke zurück, deren Inhalt sich seit dem letzten Zeichnen geändert hat."""
+        state = self.render_state()
+        previous = self.last_render_state
+        self.last_render_state = state
+        if previous is None or previous["full"][0] != state["full"][0]:
+            return [state["full"][1]]
+        return [rect for key, (value, rect) in state.items()
+                if key not in previous or previous[key][0] != value]
+
+    def render(self):
+        """
+        Zeichnet das Bild, falls sich etwas geändert hat, und überträgt nur die
+        geänderten Bereiche an den Bildschirm. Gibt True zurück, wenn gezeichnet wurde.
+        """
+        if not DIRTY_RECTS:
+            self.draw()
+            pygame.display.update()
+            return True
+
+        rects = self.dirty_rects()
+        if not rects:
+            return False
+        # Alles außerhalb der geänderten Bereiche wird beim Zeichnen übersprungen
+        self.screen.set_clip(rects[0].unionall(rects[1:]))
+        self.draw()
+        self.screen.set_clip(None)
+        pygame.display.update(rects)
+        return True
+
+    def wait_for_input(self, timeout_ms):
+        """Schläft bis zum nächsten Ereignis (höchstens timeout_ms), ohne es zu verbrauchen."""
+        event = pygame.event.wait(timeout_ms)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
 
     def draw_menu(self):
         """
@@ -869,8 +769,8 @@ class GameUI:
         """
         font_size = int(32 * self.scale_factor)
         small_font_size = int(24 * self.scale_factor)
-        title_font = pygame.font.SysFont("Arial", font_size, bold=True)
-        font = pygame.font.SysFont("Arial", small_font_size)
+        title_font = get_font(font_size, bold=True)
+        font = get_font(small_font_size)
         menu_center_x = self.menu_start_x + self.menu_width // 2
 
         # Titel und Hintergrund
@@ -916,7 +816,7 @@ class GameUI:
             difficulty_text = f" ({self.difficulty})" if (
                 self.game_mode == "ai" and self.difficulty) else ""
             status_text = mode_text + difficulty_text
-            status_font = pygame.font.SysFont("Arial", int(24 * self.scale_factor))
+            status_font = get_font(int(24 * self.scale_factor))
             status = status_font.render(status_text, True, WHITE)
             status_rect = status.get_rect(center=(self.board_offset_x + self.board_width // 2, 20))
             bg_rect = status_rect.inflate(20, 10)
@@ -932,8 +832,8 @@ class GameUI:
         """
         font_size = int(32 * self.scale_factor)
         small_font_size = int(24 * self.scale_factor)
-        font = pygame.font.SysFont("Arial", font_size, bold=True)
-        small_font = pygame.font.SysFont("Arial", small_font_size)
+        font = get_font(font_size, bold=True)
+        small_font = get_font(small_font_size)
 
         if self.winner:
             color = RED if self.winner == 1 else YELLOW
@@ -987,8 +887,8 @@ class GameUI:
     def handle_button_click(self, button_index):
         """
         Verarbeitet die Klicks auf die einzelnen Buttons.
-        Hinweis: Da der Vollbild-Button entfernt wurde,
-        entspricht der Buttonindex 7 nun dem "Spiel beenden"-Button.
+        Hinweis: Da der Vollbild-Button entfernt wurde und der Spielfeld-Button
+        hinzukam, entspricht der Buttonindex 8 nun dem "Spiel beenden"-Button.
         """
         if button_index == 0:  # Koop-Modus starten
             self.game_mode = "koop"
@@ -1008,23 +908,44 @@ class GameUI:
                 difficulties = ["Leicht", "Mittel", "Schwer", "Unschlagbar"]
                 self.difficulty = difficulties[button_index - 2]
                 self.reset_game()
-        elif button_index == 6:  # Spiel neu starten
+        elif button_index == 6:  # Nächste Spielfeldgröße
+            self.set_board_variant((self.board_variant + 1) % len(BOARD_VARIANTS))
+        elif button_index == 7:  # Spiel neu starten
             self.reset_game()
-        elif button_index == 7:  # Spiel beenden
+        elif button_index == 8:  # Spiel beenden
             self.exit_game()
 
+    def board_variant_label(self):
+        """Beschriftung des Spielfeld-Buttons, z.B. "6x7 Vier gewinnt"."""
+        rows, columns, connect = BOARD_VARIANTS[self.board_variant]
+        return f"{rows}x{columns} {CONNECT_NAMES.get(connect, connect)} gewinnt"
+
+    def set_board_variant(self, index):
+        """
+        Wechselt Spielfeldgröße und Reihenlänge (BOARD_VARIANTS[index]) und
+        startet ein neues Spiel. Zellen, Spielsteine und Grafiken werden für
+        die neue Größe neu berechnet.
+        """
+        self.board_variant = index
+        self.row_count, self.column_count, self.connect_count = BOARD_VARIANTS[index]
+        self.board_button.text = self.board_variant_label()
+        self.reset_game()
+        self.update_ui_positions()
+
     def run(self):
         """
         Hauptspielschleife.
         Hier werden Events verarbeitet (Maus, Tastatur, Fenstergrößenänderung).
         Zudem wird geprüft, ob Animationen (fallender Chip) laufen,
-        ob die KI am Zug ist, und zuletzt wird das Spielfeld gezeichnet.
+        ob die KI am Zug ist bzw. ihr Zug im Hintergrund fertig ist,
+        und zuletzt werden die geänderten Bereiche neu gezeichnet. Passiert
+        nichts, wartet die Schleife mit niedriger Bildrate (IDLE_FPS) auf Eingaben.
         """
         while True:
-            for event in pygame.event.get():
+            events = pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.exit_game()
 
                 # Bei Tastendrücken wird ESC zum Beenden genutzt.
                 if event.type == pygame.KEYDOWN:
@@ -1041,6 +962,10 @@ class GameUI:
                         self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
                         self.update_ui_positions()
 
+                # Das Fenster war verdeckt: komplett neu zeichnen
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.last_render_state = None
+
                 # Aktualisiere den Hover-Effekt, wenn sich die Maus bewegt.
                 if (event.type == pygame.MOUSEMOTION and not self.game_over and 
                     self.game_mode and not self.falling_chip):
@@ -1063,8 +988,18 @@ class GameUI:
                 if chip_landed and self.game_mode == "ai" and self.current_player == 2 and not self.game_over:
                     self.ai_make_move()
 
-            self.draw()
-            self.clock.tick(120)
+            # Ergebnis der KI-Suche abholen, sobald es vorliegt
+            self.poll_ai_move()
+            # Während der Spieler überlegt, rechnet die KI schon voraus
+            self.update_pondering()
+
+            drawn = self.render()
+            # Ohne Animation, Eingaben und Änderungen bis zum nächsten Ereignis schlafen
+            if not (events or drawn or self.falling_chip):
+                self.wait_for_input(1000 // IDLE_FPS)
+                self.clock.tick()
+            else:
+                self.clock.tick(ACTIVE_FPS)
 
 # -----------------------------------------------------------------------------
 # Spielstart:
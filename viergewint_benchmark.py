@@ -0,0 +1,255 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import time
+
+from viergewint_engine import (
+    ROW_COUNT, COLUMN_COUNT, CONNECT_COUNT, DIFFICULTIES, SOLVER_EMPTY_CELLS, WIN_SCORE, Position,
+    TranspositionTable, ParallelSearch, minimax,
+    choose_move, load_opening_book,
+)
+
+
+def random_positions(count, seed=1):
+    """Erzeugt reproduzierbare Stellungen (KI am Zug, noch nicht entschieden)."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        pos = Position()
+        plies = rng.randrange(1, 20, 2)  # ungerade Anzahl: Spieler 2 ist am Zug
+        while pos.moves < plies:
+            moves = [c for c in pos.valid_moves() if not pos.is_winning_move(c)]
+            if not moves:
+                break
+            pos.play(rng.choice(moves))
+        if pos.moves == plies:
+            positions.append(pos)
+    return positions
+
+
+def benchmark_parallel(workers, depth, count, difficulty):
+    """Vergleicht die serielle mit der wurzel-parallelen Suche bei fester Tiefe."""
+    positions = random_positions(count)
+
+    serial_time = 0.0
+    serial_results = []
+    for pos in positions:
+        start = time.perf_counter()
+        serial_results.append(minimax(pos.copy(), depth, -math.inf, math.inf, True,
+                                      difficulty, TranspositionTable()))
+        serial_time += time.perf_counter() - start
+
+    parallel = ParallelSearch(workers)
+    parallel.warm_up()
+    parallel.search(positions[0], 2, difficulty, time.time() + 60)  # Prozesse sind bereit
+
+    parallel_time = 0.0
+    agree = 0
+    for pos, (serial_col, serial_value) in zip(positions, serial_results):
+        start = time.perf_counter()
+        col, value, _ = parallel.search(pos, depth, difficulty, time.time() + 3600)
+        parallel_time += time.perf_counter() - start
+        if value == serial_value:
+            agree += 1
+    parallel.shutdown()
+
+    print(f"Stellungen: {count}, Tiefe: {depth}, Schwierigkeit: {difficulty}")
+    print(f"Seriell:            {serial_time:8.3f} s ({serial_time / count * 1000:.1f} ms/Zug)")
+    print(f"Parallel ({workers} Proz.): {parallel_time:8.3f} s "
+          f"({parallel_time / count * 1000:.1f} ms/Zug)")
+    print(f"Speedup:            {serial_time / parallel_time:8.2f}x "
+          f"(CPU-Kerne: {os.cpu_count()})")
+    print(f"Gleicher Wert:      {agree}/{count}")
+
+
+# Taktische Stellungen als Zugfolgen (Spalten ab 0). Viele Züge haben hier
+# denselben (Verlust-)Wert, abgeschnittene Züge melden also oft dieselbe
+# Schranke wie der beste Zug.
+TACTICAL_LINES = [
+    [3, 3, 4, 4, 2],                # Doppeldrohung des Gegners: jeder Zug verliert gleich schnell
+    [3, 0, 3, 0, 3],                # senkrechte Drohung in Spalte 3 muss geblockt werden
+    [0, 3, 1, 3, 6, 3],             # dasselbe für Spieler 1
+    [2, 3, 3, 4, 4, 5, 4, 5, 5],    # Gewinnzug in Spalte 6, sonst Abwehr in Spalte 5
+    [3, 2, 4, 5, 3, 3, 4],          # Spalten 1 und 6 verlieren
+    [3, 4, 3, 4, 2, 2, 5],          # nur Spalte 4 hält die Stellung
+]
+
+
+def tactical_positions():
+    """Stellungen aus TACTICAL_LINES, in denen die Partie noch nicht entschieden ist."""
+    positions = []
+    for line in TACTICAL_LINES:
+        pos = Position()
+        for col in line:
+            if pos.is_winning_move(col):
+                raise ValueError(f"Zugfolge {line} ist bereits entschieden")
+            pos.play(col)
+        positions.append(pos)
+    return positions
+
+
+def check_parallel(workers, depth, count, difficulty):
+    """
+    Prüft die wurzel-parallele Suche gegen das serielle minimax ohne
+    Transpositionstabelle: Der Wert muss übereinstimmen und der gewählte
+    Zug muss diesen Wert auch tatsächlich erreichen. Gibt die Anzahl der
+    Abweichungen zurück.
+    """
+    positions = tactical_positions() + random_positions(count)
+    parallel = ParallelSearch(workers)
+    parallel.warm_up()
+    errors = 0
+    for pos in positions:
+        ai_piece = pos.current_piece
+        _, serial_value = minimax(pos.copy(), depth, -math.inf, math.inf, True, difficulty,
+                                  ai_piece=ai_piece)
+        col, value, _ = parallel.search(pos, depth, difficulty, time.time() + 3600)
+        # Wert des gewählten Zugs seriell nachrechnen
+        child = pos.copy()
+        if child.is_winning_move(col):
+            col_value = WIN_SCORE + depth
+        else:
+            child.play(col)
+            col_value = minimax(child, depth - 1, -math.inf, math.inf, False, difficulty,
+                                ai_piece=ai_piece)[1]
+        ok = value == serial_value and col_value == serial_value
+        errors += not ok
+        print(f"Züge {pos.history}: parallel Spalte {col} ({value:.1f}), seriell {serial_value:.1f}, "
+              f"Spalte {col} erreicht {col_value:.1f} - {'ok' if ok else 'FEHLER'}")
+    parallel.shutdown()
+    print(f"Stellungen: {len(positions)}, Tiefe: {depth}, Fehler: {errors}")
+    return errors
+
+
+def percentile(values, fraction):
+    """Wert, unter dem der Anteil fraction der (sortierten) Werte liegt."""
+    if not values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(values)) - 1)
+    return values[index]
+
+
+def play_game(difficulties, rng, budget_ms=None, max_depth=None, random_plies=2, book=None,
+              solver_cells=SOLVER_EMPTY_CELLS, size=(ROW_COUNT, COLUMN_COUNT, CONNECT_COUNT)):
+    """
+    Spielt eine Partie KI gegen KI ohne Oberfläche. difficulties enthält den
+    Schwierigkeitsgrad von Spieler 1 und Spieler 2. Die ersten random_plies
+    Halbzüge sind zufällig, damit sich die Partien unterscheiden. size ist
+    (Zeilen, Spalten, Steine in einer Reihe).
+    Gibt (Gewinner oder None, Liste von (Spieler, Sekunden, Knoten)) zurück.
+    """
+    pos = Position(*size)
+    # Jede KI wertet aus ihrer eigenen Sicht und braucht deshalb eine eigene Tabelle
+    tables = {1: TranspositionTable(), 2: TranspositionTable()}
+    moves = []
+    while not pos.is_full():
+        piece = pos.current_piece
+        if pos.moves < random_plies:
+            col = rng.choice(pos.valid_moves())
+        else:
+            table = tables[piece]
+            nodes = table.stats.nodes
+            start = time.perf_counter()
+            col = choose_move(pos, difficulties[piece - 1], table, book=book, rng=rng,
+                              budget_ms=budget_ms, max_depth=max_depth,
+                              solver_cells=solver_cells)
+            moves.append((piece, time.perf_counter() - start, table.stats.nodes - nodes))
+        if pos.is_winning_move(col):
+            return piece, moves
+        pos.play(col)
+    return None, moves
+
+
+def benchmark_selfplay(difficulties, games, seed, budget_ms, max_depth, random_plies,
+                       use_book, solver_cells=SOLVER_EMPTY_CELLS,
+                       size=(ROW_COUNT, COLUMN_COUNT, CONNECT_COUNT)):
+    """
+    Lässt alle Paarungen der Schwierigkeitsgrade (mit beiden Farben)
+    gegeneinander spielen und gibt Knoten pro Sekunde, Bedenkzeiten und
+    Siegquoten aus.
+    """
+    rng = random.Random(seed)
+    book = load_opening_book() if use_book else None
+    timings = {difficulty: [] for difficulty in difficulties}
+    nodes = {difficulty: 0 for difficulty in difficulties}
+    results = {}
+
+    start = time.perf_counter()
+    for pairing in itertools.product(difficulties, repeat=2):
+        counts = results.setdefault(pairing, [0, 0, 0])  # Siege Spieler 1, Spieler 2, Remis
+        for _ in range(games):
+            winner, moves = play_game(pairing, rng, budget_ms, max_depth, random_plies, book,
+                                      solver_cells, size)
+            counts[winner - 1 if winner else 2] += 1
+            for piece, seconds, move_nodes in moves:
+                timings[pairing[piece - 1]].append(seconds)
+                nodes[pairing[piece - 1]] += move_nodes
+    duration = time.perf_counter() - start
+
+    print(f"Spielfeld: {size[0]}x{size[1]}, {size[2]} in einer Reihe")
+    print(f"Partien: {games * len(results)}, Dauer: {duration:.1f} s, Seed: {seed}, "
+          f"Bedenkzeit: {budget_ms if budget_ms is not None else 'Standard'} ms, "
+          f"max. Tiefe: {max_depth if max_depth is not None else '-'}, "
+          f"Endspiel-Löser ab {solver_cells} freien Feldern")
+    print()
+    print(f"{'Schwierigkeit':<14}{'Züge':>8}{'Knoten/s':>12}{'Ø ms':>10}"
+          f"{'p95 ms':>10}{'p99 ms':>10}")
+    for difficulty in difficulties:
+        values = sorted(timings[difficulty])
+        total = sum(values)
+        nps = nodes[difficulty] / total if total else 0.0
+        average = total / len(values) * 1000 if values else 0.0
+        print(f"{difficulty:<14}{len(values):>8}{nps:>12.0f}{average:>10.2f}"
+              f"{percentile(values, 0.95) * 1000:>10.2f}{percentile(values, 0.99) * 1000:>10.2f}")
+    print()
+    print(f"{'Spieler 1':<14}{'Spieler 2':<14}{'Sieg 1':>8}{'Sieg 2':>8}{'Remis':>8}")
+    for (first, second), (wins1, wins2, draws) in results.items():
+        print(f"{first:<14}{second:<14}{wins1 / games:>8.1%}{wins2 / games:>8.1%}"
+              f"{draws / games:>8.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks für die Vier-Gewinnt-KI")
+    parser.add_argument("mode", nargs="?", default="parallel",
+                        choices=("parallel", "check", "selfplay"),
+                        help="parallel: serielle gegen parallele Suche, "
+                             "check: parallele Suche gegen minimax prüfen, "
+                             "selfplay: Partien KI gegen KI")
+    parser.add_argument("--workers", type=int, default=max(2, os.cpu_count() or 1),
+                        help="Anzahl der Prozesse für die parallele Suche")
+    parser.add_argument("--depth", type=int, default=5, help="Suchtiefe")
+    parser.add_argument("--positions", type=int, default=10, help="Anzahl der Stellungen")
+    parser.add_argument("--difficulty", default="Unschlagbar",
+                        help="Schwierigkeitsgrad für die Bewertungsfunktion")
+    parser.add_argument("--difficulties", nargs="+", default=list(DIFFICULTIES),
+                        choices=DIFFICULTIES, help="Schwierigkeitsgrade für selfplay")
+    parser.add_argument("--games", type=int, default=10,
+                        help="Partien je Paarung (selfplay)")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert des Zufallsgenerators")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Bedenkzeit je Zug statt TIME_BUDGETS_MS (selfplay)")
+    parser.add_argument("--max-depth", type=int, default=None,
+                        help="Maximale Suchtiefe je Zug (selfplay)")
+    parser.add_argument("--random-plies", type=int, default=2,
+                        help="Zufällige Halbzüge zu Beginn jeder Partie (selfplay)")
+    parser.add_argument("--book", action="store_true",
+                        help="Eröffnungsbuch verwenden (selfplay)")
+    parser.add_argument("--rows", type=int, default=ROW_COUNT, help="Zeilen (selfplay)")
+    parser.add_argument("--columns", type=int, default=COLUMN_COUNT, help="Spalten (selfplay)")
+    parser.add_argument("--connect", type=int, default=CONNECT_COUNT,
+                        help="Steine in einer Reihe zum Sieg (selfplay)")
+    parser.add_argument("--solver-cells", type=int, default=SOLVER_EMPTY_CELLS,
+                        help="Endspiel exakt lösen ab so vielen freien Feldern, 0 = nie (selfplay)")
+    args = parser.parse_args()
+    if args.mode == "selfplay":
+        benchmark_selfplay(args.difficulties, args.games, args.seed, args.budget_ms,
+                           args.max_depth, args.random_plies, args.book,
+                           args.solver_cells, (args.rows, args.columns, args.connect))
+    elif args.mode == "check":
+        sys.exit(1 if check_parallel(args.workers, args.depth, args.positions,
+                                     args.difficulty) else 0)
+    else:
+        benchmark_parallel(args.workers, args.depth, args.positions, args.difficulty)
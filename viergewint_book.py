@@ -0,0 +1,81 @@
+import argparse
+import json
+import math
+import os
+import time
+
+from viergewint_engine import (
+    ROW_COUNT, COLUMN_COUNT, CONNECT_COUNT, BOOK_FILE, Position, TranspositionTable,
+    iterative_deepening,
+)
+
+
+def generate_book(plies, depth, difficulty, size=(ROW_COUNT, COLUMN_COUNT, CONNECT_COUNT)):
+    """
+    Berechnet für alle Stellungen der ersten plies Halbzüge, in denen die KI
+    (Spieler 2) am Zug ist, den besten Zug mit einer Suche bis depth.
+    Der Mensch kann jeden Zug spielen, die KI spielt jeweils den Buchzug.
+    size ist (Zeilen, Spalten, Steine in einer Reihe).
+    Gibt ein Dictionary Zobrist-Hash -> Spalte zurück.
+    """
+    moves = {}
+    table = TranspositionTable()
+    pos = Position(*size)
+
+    def expand():
+        # Spieler 1 (Mensch) ist am Zug
+        for human_col in pos.valid_moves():
+            if pos.is_winning_move(human_col):
+                continue
+            pos.play(human_col)
+            if pos.moves < plies and pos.hash not in moves:
+                col, value, _ = iterative_deepening(pos, math.inf, difficulty, table,
+                                                    max_depth=depth)
+                if col is not None:
+                    moves[pos.hash] = col
+                    print(f"{len(moves):5d} Stellungen  (Züge {pos.history} -> {col}, Wert {value:.1f})")
+                    if pos.moves + 1 < plies and not pos.is_winning_move(col):
+                        pos.play(col)
+                        expand()
+                        pos.undo()
+            pos.undo()
+
+    expand()
+    return moves
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Erzeugt das Eröffnungsbuch der Vier-Gewinnt-KI")
+    parser.add_argument("--plies", type=int, default=4,
+                        help="Halbzüge ab Spielbeginn, die das Buch abdeckt")
+    parser.add_argument("--depth", type=int, default=10, help="Suchtiefe je Stellung")
+    parser.add_argument("--difficulty", default="Unschlagbar",
+                        help="Schwierigkeitsgrad, für den das Buch gilt")
+    parser.add_argument("--rows", type=int, default=ROW_COUNT, help="Zeilen")
+    parser.add_argument("--columns", type=int, default=COLUMN_COUNT, help="Spalten")
+    parser.add_argument("--connect", type=int, default=CONNECT_COUNT,
+                        help="Steine in einer Reihe zum Sieg")
+    parser.add_argument("--output", default=BOOK_FILE, help="Zieldatei (JSON)")
+    args = parser.parse_args()
+    size = (args.rows, args.columns, args.connect)
+
+    start = time.perf_counter()
+    book_moves = generate_book(args.plies, args.depth, args.difficulty, size)
+    duration = time.perf_counter() - start
+
+    pos = Position(*size)
+    book = {
+        "difficulty": args.difficulty,
+        "rows": pos.rows,
+        "columns": pos.columns,
+        "connect": pos.connect,
+        "plies": args.plies,
+        "depth": args.depth,
+        "moves": {f"{key:016x}": col for key, col in sorted(book_moves.items())},
+    }
+    with open(args.output, "w") as file:
+        json.dump(book, file, separators=(",", ":"))
+
+    print(f"Eröffnungsbuch gespeichert: {args.output}")
+    print(f"Stellungen: {len(book_moves)}, Dateigröße: {os.path.getsize(args.output)} Bytes")
+    print(f"Erzeugungszeit: {duration:.1f} s")
@@ -0,0 +1,1308 @@
+import sys
+import os
+import json
+import math
+import random
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+
+# Versuche, numpy zu importieren – andernfalls wird eine Fehlermeldung ausgegeben.
+try:
+    import numpy as np
+except ImportError:
+    print("Numpy wird benötigt. Bitte installiere es mit: pip install numpy")
+    sys.exit(1)
+
+# Spielfeldkonstanten: 6 Zeilen und 7 Spalten, vier in einer Reihe gewinnen.
+# Alle Funktionen nehmen auch andere Größen und Reihenlängen entgegen.
+ROW_COUNT = 6
+COLUMN_COUNT = 7
+CONNECT_COUNT = 4
+
+# Punktwerte für entschiedene Stellungen (wie im ursprünglichen Minimax)
+WIN_SCORE = 1000000
+
+# Transpositionstabelle: maximale Anzahl Einträge und Ersetzungsstrategie
+TT_MAX_ENTRIES = 1 << 18
+TT_REPLACEMENT = "depth"  # "depth" = tiefere Einträge behalten, "always" = immer überschreiben
+
+# Bedenkzeit je Schwierigkeitsgrad in Millisekunden (iterative Vertiefung)
+TIME_BUDGETS_MS = {
+    "Schwer": 150,
+    "Unschlagbar": 1000,
+}
+
+# Exakter Endspiel-Löser: wird verwendet, sobald höchstens so viele Felder frei
+# sind (0 = nie). Er bekommt diesen Anteil der Bedenkzeit, den Rest die Heuristik.
+SOLVER_EMPTY_CELLS = 20
+SOLVER_TIME_SHARE = 0.6
+
+# Eröffnungsbuch (erzeugt mit viergewint_book.py)
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "viergewint_book.json")
+
+# Art des gespeicherten Werts
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+# -----------------------------------------------------------------------------
+# Bitboard-Hilfsfunktionen
+# -----------------------------------------------------------------------------
+# Jede Spalte belegt (ROW_COUNT + 1) Bits, Zeile 0 ist das unterste Bit der
+# Spalte. Das zusätzliche oberste Bit bleibt immer leer und verhindert, dass
+# Verschiebungen über den Spaltenrand hinweg falsche Vierer erkennen.
+#
+#   Spalte:   0  1  2  3  4  5  6
+#   (leer)    6 13 20 27 34 41 48
+#   Zeile 5   5 12 19 26 33 40 47
+#   ...
+#   Zeile 0   0  7 14 21 28 35 42
+
+def has_line(bitboard, rows=ROW_COUNT, connect=CONNECT_COUNT):
+    """
+    Prüft per Verschieben und Maskieren, ob ein Bitboard connect Steine in
+    einer Reihe enthält. Die Länge der gefundenen Folgen verdoppelt sich mit
+    jedem Schritt (1, 2, 4 ...), bei vier in einer Reihe sind es zwei Schritte.
+    """
+    height = rows + 1
+    # Vertikal, horizontal, Diagonale (/) und Diagonale (\)
+    for shift in (1, height, height + 1, height - 1):
+        run = bitboard
+        length = 1
+        while length < connect and run:
+            step = min(length, connect - length)
+            run &= run >> (step * shift)
+            length += step
+        if run:
+            return True
+    return False
+
+
+# Masken je Spielfeldgröße: unterste Zeile und alle spielbaren Felder
+_mask_cache = {}
+
+
+def board_masks(rows=ROW_COUNT, columns=COLUMN_COUNT):
+    """Liefert (bottom_mask, board_mask) für eine Spielfeldgröße."""
+    masks = _mask_cache.get((rows, columns))
+    if masks is None:
+        height = rows + 1
+        bottom = sum(1 << (c * height) for c in range(columns))
+        masks = (bottom, bottom * ((1 << rows) - 1))
+        _mask_cache[(rows, columns)] = masks
+    return masks
+
+
+def winning_cells(bitboard, mask, rows=ROW_COUNT, columns=COLUMN_COUNT,
+                  connect=CONNECT_COUNT):
+    """
+    Alle leeren Felder, auf denen ein weiterer Stein von bitboard connect in
+    einer Reihe ergäbe – egal ob das Feld schon spielbar ist oder nicht.
+    """
+    height = rows + 1
+    # Vertikal: nur connect - 1 Steine darunter
+    cells = -1
+    for k in range(1, connect):
+        cells &= bitboard << k
+    for shift in (height, height + 1, height - 1):
+        # before[k] / after[k]: k eigene Steine direkt vor bzw. hinter dem Feld
+        before = [-1]
+        after = [-1]
+        for k in range(1, connect):
+            before.append(before[-1] & (bitboard << (k * shift)))
+            after.append(after[-1] & (bitboard >> (k * shift)))
+        # Die Lücke kann an jeder Stelle der Reihe liegen
+        for k in range(connect):
+            cells |= before[k] & after[connect - 1 - k]
+    return cells & (board_masks(rows, columns)[1] ^ mask)
+
+
+def double_threat_count(bitboard, mask, rows=ROW_COUNT, columns=COLUMN_COUNT,
+                        connect=CONNECT_COUNT):
+    """
+    Zählt die spielbaren Felder, auf denen ein Stein von bitboard zwei oder
+    mehr sofort spielbare Gewinnfelder erzeugt (oder direkt gewinnt). Dafür
+    wird pro Spalte nur einmal winning_cells berechnet, statt Spielfelder zu
+    kopieren und komplett nach Vierern zu durchsuchen.
+    """
+    bottom, board_mask = board_masks(rows, columns)
+    playable = (mask + bottom) & board_mask
+    count = 0
+    while playable:
+        move = playable & -playable
+        playable ^= move
+        new_bitboard = bitboard | move
+        new_mask = mask | move
+        next_playable = (new_mask + bottom) & board_mask
+        if has_line(new_bitboard, rows, connect):
+            # Wie beim Durchprobieren: jeder weitere Zug "gewinnt"
+            threats = bin(next_playable).count("1")
+        else:
+            threats = bin(winning_cells(new_bitboard, new_mask, rows, columns, connect)
+                          & next_playable).count("1")
+        if threats >= 2:
+            count += 1
+    return count
+
+
+# Zobrist-Schlüssel je Spielfeldgröße: für jeden Spieler eine Zufallszahl pro Bit
+_zobrist_cache = {}
+
+
+def zobrist_keys(rows=ROW_COUNT, columns=COLUMN_COUNT):
+    """Liefert (und erzeugt beim ersten Aufruf) die Zobrist-Tabelle für eine Spielfeldgröße."""
+    keys = _zobrist_cache.get((rows, columns))
+    if keys is None:
+        rng = random.Random(rows * 100 + columns)  # Fester Seed: Hashes sind reproduzierbar
+        size = columns * (rows + 1)
+        keys = [[rng.getrandbits(64) for _ in range(size)] for _ in range(2)]
+        _zobrist_cache[(rows, columns)] = keys
+    return keys
+
+
+# -----------------------------------------------------------------------------
+# Position-Klasse: Spielstellung als Bitboards
+# -----------------------------------------------------------------------------
+class Position:
+    """
+    Vier-Gewinnt-Stellung, die für jeden Spieler ein Bitboard und für jede
+    Spalte die nächste freie Bitposition speichert. Züge und deren Rücknahme
+    kosten damit nur ein paar Ganzzahloperationen. connect ist die Anzahl
+    Steine in einer Reihe, die zum Sieg nötig ist.
+    """
+
+    def __init__(self, rows=ROW_COUNT, columns=COLUMN_COUNT, connect=CONNECT_COUNT):
+        self.rows = rows
+        self.columns = columns
+        self.connect = connect
+        self.bitboards = [0, 0]  # Index 0 = Spieler 1 (Rot), Index 1 = Spieler 2 (Gelb / KI)
+        # Nächste freie Bitposition je Spalte
+        self.heights = [c * (rows + 1) for c in range(columns)]
+        self.moves = 0      # Anzahl gesetzter Steine
+        self.history = []   # Gespielte Spalten (für undo)
+        self.zobrist = zobrist_keys(rows, columns)
+        self.hash = 0       # Zobrist-Hash, wird bei play/undo mitgeführt
+
+    @classmethod
+    def from_board(cls, board, connect=CONNECT_COUNT):
+        """Erstellt eine Position aus einem numpy-Spielfeld (0 = leer, 1/2 = Spieler)."""
+        rows, columns = board.shape
+        pos = cls(rows, columns, connect)
+        for c in range(columns):
+            for r in range(rows):
+                piece = int(board[r][c])
+                if piece == 0:
+                    break
+                pos.bitboards[piece - 1] |= 1 << pos.heights[c]
+                pos.hash ^= pos.zobrist[piece - 1][pos.heights[c]]
+                pos.heights[c] += 1
+                pos.moves += 1
+        return pos
+
+    def copy(self):
+        """Gibt eine unabhängige Kopie der Position zurück."""
+        pos = Position(self.rows, self.columns, self.connect)
+        pos.bitboards = self.bitboards[:]
+        pos.heights = self.heights[:]
+        pos.moves = self.moves
+        pos.history = self.history[:]
+        pos.hash = self.hash
+        return pos
+
+    @property
+    def current_piece(self):
+        """Spieler am Zug (1 oder 2). Spieler 1 beginnt immer."""
+        return 1 + (self.moves & 1)
+
+    @property
+    def mask(self):
+        """Bitboard aller belegten Felder."""
+        return self.bitboards[0] | self.bitboards[1]
+
+    def can_play(self, col):
+        """Prüft, ob in der Spalte noch Platz ist."""
+        return self.heights[col] < col * (self.rows + 1) + self.rows
+
+    def valid_moves(self):
+        """Liste aller Spalten, in die noch ein Stein passt."""
+        return [c for c in range(self.columns) if self.can_play(c)]
+
+    def next_open_row(self, col):
+        """Nächste freie Zeile der Spalte oder -1, wenn sie voll ist."""
+        if not self.can_play(col):
+            return -1
+        return self.heights[col] - col * (self.rows + 1)
+
+    def play(self, col):
+        """Setzt einen Stein des Spielers am Zug in die Spalte."""
+        player = self.moves & 1
+        self.bitboards[player] |= 1 << self.heights[col]
+        self.hash ^= self.zobrist[player][self.heights[col]]
+        self.heights[col] += 1
+        self.moves += 1
+        self.history.append(col)
+
+    def undo(self):
+        """Nimmt den zuletzt gespielten Zug zurück."""
+        col = self.history.pop()
+        self.moves -= 1
+        self.heights[col] -= 1
+        self.bitboards[self.moves & 1] ^= 1 << self.heights[col]
+        self.hash ^= self.zobrist[self.moves & 1][self.heights[col]]
+
+    def is_winning_move(self, col, piece=None):
+        """
+        Prüft, ob ein Stein von piece (Standard: Spieler am Zug) in dieser
+        Spalte connect in einer Reihe ergeben würde. Geprüft werden nur die
+        Fenster, die durch das Zielfeld verlaufen (siehe lines_through).
+        """
+        if piece is None:
+            piece = self.current_piece
+        cell = self.heights[col]
+        bitboard = self.bitboards[piece - 1] | (1 << cell)
+        for line in lines_through(self.rows, self.columns, self.connect)[cell]:
+            if bitboard & line == line:
+                return True
+        return False
+
+    def has_won(self, piece):
+        """Prüft, ob der Spieler (piece) bereits connect in einer Reihe hat."""
+        return has_line(self.bitboards[piece - 1], self.rows, self.connect)
+
+    def winning_cells(self, piece):
+        """Bitboard aller Felder, auf denen piece mit einem Stein gewinnen würde."""
+        return winning_cells(self.bitboards[piece - 1], self.mask, self.rows, self.columns,
+                             self.connect)
+
+    def is_full(self):
+        """Gibt True zurück, wenn keine leere Zelle mehr vorhanden ist."""
+        return self.moves == self.rows * self.columns
+
+    def cells(self):
+        """
+        Gibt die Belegung als numpy-Vektor im Bitboard-Layout zurück
+        (Index = Bitposition, 0 = leer, 1/2 = Spieler).
+        """
+        size = self.columns * (self.rows + 1)
+        nbytes = (size + 7) // 8
+        raw = (self.bitboards[0].to_bytes(nbytes, "little")
+               + self.bitboards[1].to_bytes(nbytes, "little"))
+        bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little")
+        bits = bits.reshape(2, nbytes * 8)[:, :size]
+        return bits[0] + 2 * bits[1]
+
+    def to_array(self):
+        """Wandelt die Position in ein numpy-Spielfeld wie in GameUI um."""
+        board = np.zeros((self.rows, self.columns))
+        for c in range(self.columns):
+            base = c * (self.rows + 1)
+            for r in range(self.heights[c] - base):
+                bit = 1 << (base + r)
+                board[r][c] = 1 if self.bitboards[0] & bit else 2
+        return board
+
+
+# -----------------------------------------------------------------------------
+# Transpositionstabelle
+# -----------------------------------------------------------------------------
+class TableStats:
+    """Zählt Zugriffe auf die Transpositionstabelle, um ihre Größe abstimmen zu können."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nodes = 0       # Besuchte Knoten der Suche
+        self.probes = 0      # Anfragen
+        self.hits = 0        # Anfragen mit passendem Eintrag
+        self.cutoffs = 0     # Treffer, die den Knoten direkt beendet haben
+        self.stores = 0      # Geschriebene Einträge
+        self.overwrites = 0  # Dabei verdrängte fremde Einträge
+        self.rejected = 0    # Wegen der Ersetzungsstrategie verworfene Einträge
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def __str__(self):
+        return (f"{self.nodes} Knoten, TT: {self.probes} Anfragen, {self.hits} Treffer "
+                f"({self.hit_rate:.1%}), {self.cutoffs} Cutoffs, "
+                f"{self.stores} gespeichert, {self.overwrites} verdrängt")
+
+
+class TranspositionTable:
+    """
+    Speichert Suchergebnisse (Tiefe, Wert, Art des Werts, bester Zug) je
+    Zobrist-Hash. Die Tabelle hat eine feste Anzahl Plätze; bei Kollisionen
+    entscheidet die Ersetzungsstrategie, welcher Eintrag bleibt.
+    """
+
+    def __init__(self, max_entries=TT_MAX_ENTRIES, replacement=TT_REPLACEMENT):
+        if replacement not in ("depth", "always"):
+            raise ValueError(f"Unbekannte Ersetzungsstrategie: {replacement}")
+        self.max_entries = max_entries
+        self.replacement = replacement
+        self.slots = [None] * max_entries
+        self.stats = TableStats()
+
+    def clear(self):
+        """Leert die Tabelle (z.B. bei einem neuen Spiel)."""
+        self.slots = [None] * self.max_entries
+        self.stats.reset()
+
+    def probe(self, key):
+        """Gibt (depth, value, flag, move) für den Hash zurück oder None."""
+        self.stats.probes += 1
+        entry = self.slots[key % self.max_entries]
+        if entry is not None and entry[0] == key:
+            self.stats.hits += 1
+            return entry[1:]
+        return None
+
+    def store(self, key, depth, value, flag, move):
+        """Speichert ein Suchergebnis gemäß der Ersetzungsstrategie."""
+        index = key % self.max_entries
+        old = self.slots[index]
+        if old is not None:
+            if (self.replacement == "depth" and old[0] != key
+                    and old[1] > depth):
+                self.stats.rejected += 1
+                return
+            if old[0] != key:
+                self.stats.overwrites += 1
+        self.slots[index] = (key, depth, value, flag, move)
+        self.stats.stores += 1
+
+
+# -----------------------------------------------------------------------------
+# Heuristische Bewertung (arbeitet auf numpy-Spielfeldern)
+# -----------------------------------------------------------------------------
+def evaluate_window(window, piece, difficulty=None):
+    """
+    Bewertet ein Fenster (Liste von 4 bzw. connect Zellen) für die KI.
+    Je nachdem, wie viele gleiche Spielsteine (oder Gegner) im Fenster sind, wird ein Wert zurückgegeben.
+    """
+    opponent = 1 if piece == 2 else 2
+    connect = len(window)
+
+    if window.count(piece) == connect:
+        return 100
+    elif window.count(piece) == connect - 1 and window.count(0) == 1:
+        return 10
+    elif window.count(piece) == connect - 2 and window.count(0) == 2:
+        return 2
+
+    if window.count(opponent) == connect - 1 and window.count(0) == 1:
+        return -80
+    elif (window.count(opponent) == connect - 2 and window.count(0) == 2 and
+          difficulty == "Unschlagbar"):
+        return -3
+
+    return 0
+
+
+def get_next_open_row_for_board(board, col):
+    """Ermittelt die nächste freie Zeile für ein gegebenes Board (wird in der KI genutzt)."""
+    col = int(col)
+    for r in range(board.shape[0]):
+        if board[r][col] == 0:
+            return r
+    return -1
+
+
+def check_win_at(board, row, col, piece, connect=CONNECT_COUNT):
+    """
+    Prüft, ob der Stein von piece auf (row, col) connect in einer Reihe bildet.
+    Es werden nur die vier Richtungen durch dieses Feld untersucht, da sich
+    nach einem Zug nur dort etwas geändert haben kann.
+    """
+    row_count, column_count = board.shape
+    for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        count = 1
+        for sign in (1, -1):
+            r = row + sign * d_row
+            c = col + sign * d_col
+            while (0 <= r < row_count and 0 <= c < column_count
+                   and board[r][c] == piece):
+                count += 1
+                r += sign * d_row
+                c += sign * d_col
+        if count >= connect:
+            return True
+    return False
+
+
+def check_win_on_board(board, piece, connect=CONNECT_COUNT):
+    """Prüft, ob ein Spieler (piece) auf einem bestimmten Board gewonnen hat."""
+    row_count, column_count = board.shape
+    n = connect
+    for c in range(column_count - n + 1):
+        for r in range(row_count):
+            if all(board[r][c + i] == piece for i in range(n)):
+                return True
+
+    for c in range(column_count):
+        for r in range(row_count - n + 1):
+            if all(board[r + i][c] == piece for i in range(n)):
+                return True
+
+    for c in range(column_count - n + 1):
+        for r in range(row_count - n + 1):
+            if all(board[r + i][c + i] == piece for i in range(n)):
+                return True
+
+    for c in range(column_count - n + 1):
+        for r in range(n - 1, row_count):
+            if all(board[r - i][c + i] == piece for i in range(n)):
+                return True
+
+    return False
+
+
+# Tabelle aller Fenster (connect Felder in einer Reihe) je Spielfeldgröße
+_window_cache = {}
+
+
+def window_table(rows=ROW_COUNT, columns=COLUMN_COUNT, connect=CONNECT_COUNT):
+    """
+    Liefert für eine Spielfeldgröße alle Fenster aus connect Feldern als
+    Bitpositionen (Array der Form (Fenster, connect)), deren Gewichte mal 10
+    (horizontal 10, vertikal 12, diagonal 11) und die Bitpositionen der
+    mittleren Spalte. Für 6x7 mit vier in einer Reihe sind es 69 Fenster.
+    """
+    table = _window_cache.get((rows, columns, connect))
+    if table is None:
+        height = rows + 1
+        n = connect
+        windows = []
+        weights = []
+        for r in range(rows):
+            for c in range(columns - n + 1):
+                windows.append([(c + i) * height + r for i in range(n)])
+                weights.append(10)
+        for c in range(columns):
+            for r in range(rows - n + 1):
+                windows.append([c * height + r + i for i in range(n)])
+                weights.append(12)
+        for r in range(rows - n + 1):
+            for c in range(columns - n + 1):
+                windows.append([(c + i) * height + r + i for i in range(n)])
+                weights.append(11)
+        for r in range(n - 1, rows):
+            for c in range(columns - n + 1):
+                windows.append([(c + i) * height + r - i for i in range(n)])
+                weights.append(11)
+        center = columns // 2
+        center_bits = np.arange(center * height, center * height + rows)
+        table = (np.array(windows, dtype=np.intp).reshape(-1, n), np.array(weights),
+                 center_bits)
+        _window_cache[(rows, columns, connect)] = table
+    return table
+
+
+# Ein Fenster wird als Zahl zur Basis 3 codiert (Zelle k zählt 3**k), der
+# Wert jedes der 3**connect möglichen Fenster (81 bei vier in einer Reihe)
+# steht in einer Tabelle je Spieler, Schwierigkeitsgrad und Reihenlänge.
+# Die Werte stammen direkt aus evaluate_window.
+_window_score_cache = {}
+
+
+def window_codes(connect=CONNECT_COUNT):
+    """Faktoren für die Codierung eines Fensters: 1, 3, 9, 27 ..."""
+    return 3 ** np.arange(connect)
+
+
+def window_scores(piece, difficulty=None, connect=CONNECT_COUNT):
+    """Bewertung aller 3**connect möglichen Fenster für piece (Index = Fenstercode)."""
+    key = (piece, difficulty == "Unschlagbar", connect)
+    scores = _window_score_cache.get(key)
+    if scores is None:
+        scores = np.array([
+            evaluate_window([(code // 3 ** k) % 3 for k in range(connect)], piece,
+                            difficulty)
+            for code in range(3 ** connect)
+        ])
+        _window_score_cache[key] = scores
+    return scores
+
+
+# Fenster je Feld für die Gewinnprüfung nach einem Zug (siehe lines_through)
+_lines_cache = {}
+
+
+def lines_through(rows=ROW_COUNT, columns=COLUMN_COUNT, connect=CONNECT_COUNT):
+    """
+    Liefert je Bitposition die Bitmasken aller Fenster, die durch dieses Feld
+    verlaufen (bei vier in einer Reihe höchstens 16, am Rand deutlich weniger).
+    """
+    lines = _lines_cache.get((rows, columns, connect))
+    if lines is None:
+        windows = window_table(rows, columns, connect)[0]
+        lines = [[] for _ in range(columns * (rows + 1))]
+        for window in windows.tolist():
+            line = sum(1 << bit for bit in window)
+            for bit in window:
+                lines[bit].append(line)
+        _lines_cache[(rows, columns, connect)] = lines
+    return lines
+
+
+def score_cells(cells, piece, difficulty=None, rows=ROW_COUNT, columns=COLUMN_COUNT,
+                connect=CONNECT_COUNT):
+    """
+    Bewertet alle Fenster einer Stellung (cells im Bitboard-Layout, siehe
+    Position.cells) oder eines Stapels von Stellungen (Form (N, Bits)) in
+    einem numpy-Durchgang. Entspricht score_position ohne die zusätzliche
+    Bedrohungsprüfung des "Unschlagbar"-Modus.
+    """
+    windows, weights, center_bits = window_table(rows, columns, connect)
+    codes = cells[..., windows] @ window_codes(connect)
+    total = window_scores(piece, difficulty, connect)[codes] @ weights
+    center_count = np.count_nonzero(cells[..., center_bits] == piece, axis=-1)
+    # Ganzzahlig mal 10 gerechnet, damit die Gewichte 1.2 / 1.1 exakt bleiben
+    return (total + center_count * 60) / 10
+
+
+def board_cells(board):
+    """Wandelt ein numpy-Spielfeld (Zeilen x Spalten) ins Bitboard-Layout um."""
+    rows, columns = board.shape[-2:]
+    cells = np.zeros(board.shape[:-2] + (columns, rows + 1), dtype=np.intp)
+    cells[..., :rows] = np.swapaxes(board, -1, -2)
+    return cells.reshape(board.shape[:-2] + (columns * (rows + 1),))
+
+
+def double_threat_penalty(board, piece, connect=CONNECT_COUNT):
+    """
+    Zusatzbewertung des "Unschlagbar"-Modus: -100 für jedes spielbare Feld,
+    auf dem der Gegner von piece zwei oder mehr Gewinndrohungen gleichzeitig
+    hätte. Berechnet auf Bitboards (siehe double_threat_count).
+    """
+    pos = Position.from_board(board, connect)
+    opponent = 1 if piece == 2 else 2
+    return -100 * double_threat_count(pos.bitboards[opponent - 1], pos.mask,
+                                      pos.rows, pos.columns, connect)
+
+
+def score_position(board, piece, difficulty=None, connect=CONNECT_COUNT):
+    """
+    Bewertet die gesamte Brettposition für den Spieler (piece) unter Anwendung verschiedener Strategien.
+    Dazu gehören:
+      - Gewichtung der zentralen Spalte (x6),
+      - horizontale (x1), vertikale (x1.2) und diagonale (x1.1) Anordnungen,
+      - Vermeiden von "Trap"-Situationen.
+    Alle Fenster werden über score_cells in einem numpy-Durchgang bewertet.
+    """
+    rows, columns = board.shape
+    score = score_cells(board_cells(board.astype(np.intp)), piece, difficulty,
+                        rows, columns, connect)
+
+    # Prüfe zusätzliche Bedrohungen im "Unschlagbar"-Modus
+    if difficulty == "Unschlagbar":
+        score += double_threat_penalty(board, piece, connect)
+
+    return score
+
+
+def evaluate_position(pos, piece, difficulty=None):
+    """Bewertet eine Position (Blatt der Suche) wie score_position."""
+    score = score_cells(pos.cells(), piece, difficulty, pos.rows, pos.columns, pos.connect)
+    if difficulty == "Unschlagbar":
+        opponent = 1 if piece == 2 else 2
+        score -= 100 * double_threat_count(pos.bitboards[opponent - 1], pos.mask,
+                                           pos.rows, pos.columns, pos.connect)
+    return float(score)
+
+
+# -----------------------------------------------------------------------------
+# Suche
+# -----------------------------------------------------------------------------
+class SearchTimeout(Exception):
+    """Wird ausgelöst, wenn die Bedenkzeit einer Suche abgelaufen ist."""
+
+
+def minimax(pos, depth, alpha, beta, maximizing_player, difficulty=None, table=None,
+            deadline=None, pv=None, stop=None, ai_piece=2):
+    """
+    Minimax mit Alpha-Beta-Pruning auf einer Position. Die KI (ai_piece,
+    standardmäßig Spieler 2) maximiert. Züge werden mit play/undo auf derselben Position gesetzt
+    und wieder zurückgenommen, statt das Spielfeld zu kopieren.
+    Ist eine Transpositionstabelle (table) angegeben, werden bereits
+    durchsuchte Stellungen wiederverwendet und deren bester Zug zuerst probiert.
+    Die Position darf noch nicht entschieden sein: Gewinnzüge werden beim
+    Setzen über is_winning_move erkannt, nicht durch Absuchen jedes Knotens.
+    deadline (time.perf_counter()-Wert) bricht die Suche mit SearchTimeout ab,
+    pv ist die Hauptvariante der vorherigen Iteration ab diesem Knoten.
+    Ein gesetztes stop-Event (threading.Event) bricht die Suche ebenfalls ab.
+    """
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout()
+    if stop is not None and stop.is_set():
+        raise SearchTimeout()
+    if table is not None:
+        table.stats.nodes += 1
+
+    valid_locations = pos.valid_moves()
+    if len(valid_locations) == 0 or depth == 0:
+        return (None, evaluate_position(pos, ai_piece, difficulty))
+    opponent = 1 if ai_piece == 2 else 2
+
+    # Sortiere die gültigen Spalten, sodass die mittleren Spalten zuerst geprüft werden.
+    middle = pos.columns // 2
+    valid_locations.sort(key=lambda x: abs(x - middle))
+
+    alpha_orig, beta_orig = alpha, beta
+    if table is not None:
+        entry = table.probe(pos.hash)
+        if entry is not None:
+            entry_depth, entry_value, entry_flag, entry_move = entry
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    table.stats.cutoffs += 1
+                    return entry_move, entry_value
+                elif entry_flag == LOWER_BOUND:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    table.stats.cutoffs += 1
+                    return entry_move, entry_value
+            # Bester Zug aus einer früheren Suche zuerst
+            if entry_move in valid_locations:
+                valid_locations.remove(entry_move)
+                valid_locations.insert(0, entry_move)
+    # Der Zug der Hauptvariante hat Vorrang vor allen anderen
+    if pv and pv[0] in valid_locations:
+        valid_locations.remove(pv[0])
+        valid_locations.insert(0, pv[0])
+    column = valid_locations[0]
+
+    if maximizing_player:
+        value = -math.inf
+        for col in valid_locations:
+            if pos.is_winning_move(col, ai_piece):
+                value = WIN_SCORE + depth
+                column = col
+                break
+
+            child_pv = pv[1:] if pv and pv[0] == col else None
+            pos.play(col)
+            new_score = minimax(pos, depth - 1, alpha, beta, False, difficulty, table,
+                                deadline, child_pv, stop, ai_piece)[1]
+            pos.undo()
+            if new_score > value:
+                value = new_score
+                column = col
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+    else:
+        value = math.inf
+        for col in valid_locations:
+            if pos.is_winning_move(col, opponent):
+                # Entspricht dem Wert, den der Kindknoten für den Sieg liefern würde
+                new_score = -WIN_SCORE - (depth - 1)
+            else:
+                child_pv = pv[1:] if pv and pv[0] == col else None
+                pos.play(col)
+                new_score = minimax(pos, depth - 1, alpha, beta, True, difficulty, table,
+                                    deadline, child_pv, stop, ai_piece)[1]
+                pos.undo()
+            if new_score < value:
+                value = new_score
+                column = col
+            beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+    if table is not None:
+        if value <= alpha_orig:
+            flag = UPPER_BOUND
+        elif value >= beta_orig:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        table.store(pos.hash, depth, value, flag, column)
+
+    return column, value
+
+
+def read_line(pos, table, length):
+    """Folgt ab pos den besten Zügen der Transpositionstabelle (höchstens length Züge)."""
+    line = []
+    pos = pos.copy()
+    while len(line) < length and table is not None:
+        entry = table.slots[pos.hash % table.max_entries]
+        if entry is None or entry[0] != pos.hash:
+            break
+        move = entry[4]
+        if move is None or not pos.can_play(move):
+            break
+        line.append(move)
+        pos.play(move)
+    return line
+
+
+def principal_variation(pos, table, depth, first_move):
+    """Liest die Hauptvariante (Folge bester Züge) aus der Transpositionstabelle."""
+    pos = pos.copy()
+    pos.play(first_move)
+    return [first_move] + read_line(pos, table, depth - 1)
+
+
+def iterative_deepening(pos, budget_ms, difficulty=None, table=None, max_depth=None,
+                        stop=None, parallel=None):
+    """
+    Sucht mit Tiefe 1, 2, 3 ... bis die Bedenkzeit (budget_ms) abgelaufen ist
+    und gibt (Spalte, Wert, erreichte Tiefe) der letzten vollständigen
+    Iteration zurück. Jede Iteration beginnt mit der Hauptvariante der
+    vorherigen, damit Alpha-Beta möglichst früh abschneidet.
+    Tiefe 1 wird immer vollständig durchsucht, außer stop wird gesetzt.
+    Mit parallel (ParallelSearch) werden ab Tiefe 2 die Züge an der Wurzel
+    auf mehrere Prozesse verteilt. Gesucht wird für den Spieler am Zug.
+    """
+    deadline = time.perf_counter() + budget_ms / 1000
+    wall_deadline = time.time() + budget_ms / 1000
+    if max_depth is None:
+        max_depth = pos.rows * pos.columns - pos.moves
+    best = (None, 0, 0)
+    if pos.has_won(1) or pos.has_won(2):
+        return best
+    ai_piece = pos.current_piece
+    pv = None
+    for depth in range(1, max_depth + 1):
+        try:
+            if parallel is not None and depth > 1:
+                col, value, pv = parallel.search(pos, depth, difficulty,
+                                                 wall_deadline, pv, stop)
+            else:
+                # Auf einer Kopie suchen: ein Abbruch lässt gesetzte Züge zurück
+                col, value = minimax(pos.copy(), depth, -math.inf, math.inf, True,
+                                     difficulty, table,
+                                     deadline if depth > 1 else None, pv, stop, ai_piece)
+                if col is not None:
+                    pv = principal_variation(pos, table, depth, col)
+        except SearchTimeout:
+            break
+        if col is None:
+            break
+        best = (col, value, depth)
+        # Entschiedene Stellungen werden durch tiefere Suche nicht besser
+        if abs(value) >= WIN_SCORE:
+            break
+    return best
+
+
+# -----------------------------------------------------------------------------
+# Exakter Endspiel-Löser
+# -----------------------------------------------------------------------------
+# Werte aus Sicht des Spielers am Zug: positiv = Sieg, je früher desto höher
+# ((freie Felder + 1) // 2 beim Sieg mit dem nächsten Stein), 0 = Remis,
+# negativ = Niederlage. Die Einträge teilen sich die Transpositionstabelle
+# mit der Heuristik, ihr Hash wird dafür mit SOLVER_SALT unterschieden.
+SOLVER_SALT = 0x5A17_C0DE_D00D_F00D
+
+
+def negamax(pos, alpha, beta, table, deadline=None, stop=None):
+    """
+    Negamax mit Alpha-Beta für den exakten Wert einer Position (siehe oben).
+    Züge, nach denen der Gegner sofort gewinnt, werden gar nicht erst
+    durchsucht; die übrigen werden nach der Anzahl der eigenen Gewinnfelder
+    sortiert, die sie erzeugen. Die Position darf noch nicht entschieden sein.
+    """
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout()
+    if stop is not None and stop.is_set():
+        raise SearchTimeout()
+    table.stats.nodes += 1
+
+    rows, columns, connect = pos.rows, pos.columns, pos.connect
+    size = rows * columns
+    moves = pos.moves
+    me = pos.bitboards[moves & 1]
+    opponent = pos.bitboards[1 - (moves & 1)]
+    mask = me | opponent
+    bottom, board_mask = board_masks(rows, columns)
+    playable = (mask + bottom) & board_mask
+
+    if winning_cells(me, mask, rows, columns, connect) & playable:
+        return (size + 1 - moves) // 2
+
+    # Gewinnfelder des Gegners müssen blockiert werden, darunter darf man nicht setzen
+    opponent_wins = winning_cells(opponent, mask, rows, columns, connect)
+    forced = playable & opponent_wins
+    if forced:
+        if forced & (forced - 1):
+            return -((size - moves) // 2)
+        playable = forced
+    playable &= ~(opponent_wins >> 1)
+    if not playable:
+        return -((size - moves) // 2)
+    if moves >= size - 2:
+        return 0
+
+    lower = -((size - 2 - moves) // 2)
+    upper = (size - 1 - moves) // 2
+    key = pos.hash ^ SOLVER_SALT
+    entry = table.probe(key)
+    if entry is not None:
+        _, entry_value, entry_flag, _ = entry
+        if entry_flag == LOWER_BOUND:
+            lower = max(lower, entry_value)
+        else:
+            upper = min(upper, entry_value)
+    alpha = max(alpha, lower)
+    beta = min(beta, upper)
+    if alpha >= beta:
+        table.stats.cutoffs += 1
+        return alpha
+
+    # Reihenfolge: viele neue Gewinnfelder zuerst, bei Gleichstand die Mitte
+    height = rows + 1
+    middle = columns // 2
+    candidates = []
+    for col in sorted(range(columns), key=lambda c: abs(c - middle)):
+        move = playable & (((1 << rows) - 1) << (col * height))
+        if move:
+            threats = bin(winning_cells(me | move, mask | move, rows, columns,
+                                        connect)).count("1")
+            candidates.append((-threats, len(candidates), col))
+    candidates.sort()
+
+    for _, _, col in candidates:
+        pos.play(col)
+        score = -negamax(pos, -beta, -alpha, table, deadline, stop)
+        pos.undo()
+        if score >= beta:
+            table.store(key, size - moves, score, LOWER_BOUND, col)
+            return score
+        if score > alpha:
+            alpha = score
+    table.store(key, size - moves, alpha, UPPER_BOUND, None)
+    return alpha
+
+
+def solve(pos, table, deadline=None, stop=None):
+    """
+    Exakter Wert der Position. Statt eines vollen Fensters werden nur
+    Nullfenster-Suchen gestellt ("ist der Wert größer als x?"), deren
+    Schranke den möglichen Bereich jeweils halbiert.
+    """
+    size = pos.rows * pos.columns
+    lower = -((size - pos.moves) // 2)
+    upper = (size + 1 - pos.moves) // 2
+    while lower < upper:
+        middle = lower + (upper - lower) // 2
+        # Näher an 0 beginnen: Remis und knappe Ergebnisse sind am häufigsten
+        if middle <= 0 and lower // 2 < middle:
+            middle = lower // 2
+        elif middle >= 0 and upper // 2 > middle:
+            middle = upper // 2
+        result = negamax(pos, middle, middle + 1, table, deadline, stop)
+        if result <= middle:
+            upper = result
+        else:
+            lower = result
+    return lower
+
+
+def solve_move(pos, table, deadline=None, stop=None):
+    """
+    Löst die Position exakt und gibt (Spalte, Wert) eines Zugs zurück, der
+    diesen Wert erreicht. Bei einer verlorenen Stellung wird der Zug
+    gewählt, der die Niederlage am längsten hinauszögert.
+    """
+    pos = pos.copy()
+    moves = pos.valid_moves()
+    for col in moves:
+        if pos.is_winning_move(col):
+            return col, (pos.rows * pos.columns + 1 - pos.moves) // 2
+
+    score = solve(pos, table, deadline, stop)
+    middle = pos.columns // 2
+    moves.sort(key=lambda c: abs(c - middle))
+    for col in moves:
+        pos.play(col)
+        # Erreicht dieser Zug den Wert? Eine Nullfenster-Suche genügt.
+        reaches = -negamax(pos, -score, -score + 1, table, deadline, stop) >= score
+        pos.undo()
+        if reaches:
+            return col, score
+    return moves[0], score
+
+
+# -----------------------------------------------------------------------------
+# Eröffnungsbuch
+# -----------------------------------------------------------------------------
+def load_opening_book(path=BOOK_FILE):
+    """
+    Lädt ein Eröffnungsbuch. Gibt ein Dictionary mit "difficulty" und
+    "moves" (Zobrist-Hash -> Spalte) zurück oder None, falls keins existiert.
+    """
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Fehler beim Laden des Eröffnungsbuchs: {e}")
+        return None
+    data["moves"] = {int(key, 16): col for key, col in data["moves"].items()}
+    return data
+
+
+def book_move(book, pos, difficulty):
+    """Zug aus dem Eröffnungsbuch für die Position oder None, wenn sie nicht enthalten ist."""
+    if book is None or book.get("difficulty") != difficulty:
+        return None
+    if ((pos.rows, pos.columns, pos.connect)
+            != (book.get("rows"), book.get("columns"), book.get("connect", CONNECT_COUNT))):
+        return None
+    col = book["moves"].get(pos.hash)
+    if col is None or not pos.can_play(col):
+        return None
+    return col
+
+
+# -----------------------------------------------------------------------------
+# Zugwahl je Schwierigkeitsgrad
+# -----------------------------------------------------------------------------
+DIFFICULTIES = ("Leicht", "Mittel", "Schwer", "Unschlagbar")
+
+
+def find_immediate_win(pos, valid_columns, piece):
+    """Gibt die erste Spalte zurück, mit der piece sofort gewinnt, sonst None."""
+    for col in valid_columns:
+        if pos.is_winning_move(col, piece):
+            return col
+    return None
+
+
+def search_best_move(pos, difficulty, table, stop=None, parallel=None, book=None,
+                     budget_ms=None, max_depth=None, verbose=False, solver_cells=0,
+                     pondered=None):
+    """
+    Sucht per iterativer Vertiefung den besten Zug für den Spieler am Zug.
+    Wie lange gesucht wird, bestimmt die Bedenkzeit des Schwierigkeitsgrads
+    (TIME_BUDGETS_MS) – nicht eine feste Suchtiefe; budget_ms und max_depth
+    überschreiben das (z.B. für reproduzierbare Benchmarks). Mit parallel
+    werden die Züge an der Wurzel auf mehrere Prozesse verteilt.
+    Steht die Position im Eröffnungsbuch (book), wird gar nicht gesucht.
+    Sind höchstens solver_cells Felder frei, wird die Stellung zuerst exakt
+    gelöst; reicht der Anteil SOLVER_TIME_SHARE der Bedenkzeit dafür nicht,
+    sucht die Heuristik in der restlichen Zeit.
+    Hat ponder die Antwort schon im Voraus berechnet (pondered), wird sie
+    ohne weitere Suche übernommen.
+    """
+    col = book_move(book, pos, difficulty)
+    if col is not None:
+        if verbose:
+            print(f"KI-Zug aus dem Eröffnungsbuch: Spalte {col}")
+        return col
+    if pondered is not None:
+        col = pondered.get(pos.hash)
+        if col is not None and pos.can_play(col):
+            if verbose:
+                print(f"KI-Zug aus dem Vorausdenken: Spalte {col}")
+            return col
+
+    if budget_ms is None:
+        budget_ms = TIME_BUDGETS_MS[difficulty]
+    if pos.rows * pos.columns - pos.moves <= solver_cells:
+        start = time.perf_counter()
+        try:
+            col, score = solve_move(pos, table, start + budget_ms * SOLVER_TIME_SHARE / 1000,
+                                    stop)
+            if verbose:
+                result = "Sieg" if score > 0 else "Niederlage" if score < 0 else "Remis"
+                print(f"Endspiel gelöst: Spalte {col} ({result}), {table.stats}")
+            return col
+        except SearchTimeout:
+            budget_ms -= (time.perf_counter() - start) * 1000
+            if verbose:
+                print("Endspiel nicht rechtzeitig gelöst, weiter mit der Heuristik")
+    try:
+        col, _, depth = iterative_deepening(pos, budget_ms, difficulty, table,
+                                            max_depth=max_depth, stop=stop,
+                                            parallel=parallel)
+        if verbose and not (stop and stop.is_set()):
+            print(f"KI-Suche: Tiefe {depth}, {table.stats}")
+        return col
+    except Exception as e:
+        print(f"Fehler in der KI-Suche: {e}")
+        return None
+
+
+def choose_move(pos, difficulty, table=None, stop=None, parallel=None, book=None,
+                rng=random, budget_ms=None, max_depth=None, verbose=False,
+                solver_cells=SOLVER_EMPTY_CELLS, pondered=None):
+    """
+    Berechnet den Zug der KI für den Spieler am Zug und gibt die Spalte
+    zurück. Hier werden je nach Schwierigkeitsgrad verschiedene Strategien
+    angewandt; nur Unschlagbar löst Endspiele exakt (ab solver_cells freien
+    Feldern). rng liefert die Zufallszüge (random.Random für reproduzierbare
+    Partien). Die Werte in table gelten aus Sicht eines Spielers: spielen
+    zwei KIs gegeneinander, braucht jede ihre eigene Tabelle. pondered
+    enthält die von ponder vorausberechneten Antworten (Hash -> Spalte).
+    """
+    valid_columns = pos.valid_moves()
+    if not valid_columns:
+        return None
+    piece = pos.current_piece
+    opponent = 1 if piece == 2 else 2
+    if table is None:
+        table = TranspositionTable()
+
+    try:
+        # Leichter Schwierigkeitsgrad: Mischung aus intelligenten und zufälligen Zügen.
+        if difficulty == "Leicht":
+            if rng.random() > 0.4:
+                col = find_immediate_win(pos, valid_columns, piece)
+                if col is not None:
+                    return col
+
+                if rng.random() > 0.3:
+                    col = find_immediate_win(pos, valid_columns, opponent)
+                    if col is not None:
+                        return col
+
+            return rng.choice(valid_columns)
+        # Mittlerer Schwierigkeitsgrad: Gewinne praktikabel selbst prüfen und blockieren.
+        elif difficulty == "Mittel":
+            for p in (piece, opponent):
+                col = find_immediate_win(pos, valid_columns, p)
+                if col is not None:
+                    return col
+
+            center_columns = [c for c in valid_columns
+                              if c >= pos.columns // 3 and
+                              c <= 2 * pos.columns // 3]
+            if center_columns:
+                return rng.choice(center_columns)
+            return rng.choice(valid_columns)
+        # Schwerer Schwierigkeitsgrad: Mischung aus Gewinnprüfungen und Minimax.
+        elif difficulty == "Schwer":
+            for p in (piece, opponent):
+                col = find_immediate_win(pos, valid_columns, p)
+                if col is not None:
+                    return col
+
+            col = search_best_move(pos, difficulty, table, stop, book=book,
+                                   budget_ms=budget_ms, max_depth=max_depth,
+                                   verbose=verbose, pondered=pondered)
+            if col is not None:
+                return col
+            return rng.choice(valid_columns)
+        # Unschlagbar: höchste Priorität für Gewinne und Blockaden,
+        # danach die längste Bedenkzeit aller Schwierigkeitsgrade.
+        elif difficulty == "Unschlagbar":
+            for p in (piece, opponent):
+                col = find_immediate_win(pos, valid_columns, p)
+                if col is not None:
+                    return col
+
+            col = search_best_move(pos, difficulty, table, stop, parallel, book,
+                                   budget_ms, max_depth, verbose, solver_cells, pondered)
+            if col is not None and pos.can_play(col):
+                return col
+            center_columns = [c for c in valid_columns
+                              if abs(c - pos.columns // 2) <= 1]
+            if center_columns:
+                return rng.choice(center_columns)
+            return rng.choice(valid_columns)
+        else:
+            return rng.choice(valid_columns)
+    except Exception as e:
+        print(f"Fehler beim KI-Zug: {e}")
+        return rng.choice(valid_columns)
+
+
+def ponder(pos, difficulty, table, results, stop, parallel=None, book=None,
+           solver_cells=SOLVER_EMPTY_CELLS, passes=3, preferred=None):
+    """
+    Denkt voraus, während der Gegner am Zug ist: Für jeden möglichen Zug des
+    Gegners wird die Antwort gesucht und in results (Hash der Stellung nach
+    dem Gegnerzug -> Spalte) eingetragen; die Suchergebnisse landen in der
+    gemeinsamen Transpositionstabelle. Jeder Durchgang verdoppelt die
+    Bedenkzeit je Antwort. Läuft, bis alle Durchgänge fertig sind oder stop
+    gesetzt wird; abgebrochene Suchen werden nicht eingetragen.
+    preferred() kann die Spalte liefern, die der Gegner wahrscheinlich
+    spielt (z.B. die unter dem Mauszeiger); sie wird als Nächstes durchsucht.
+    """
+    if difficulty not in TIME_BUDGETS_MS:
+        return
+    if difficulty != "Unschlagbar":
+        parallel = None
+        solver_cells = 0
+    pos = pos.copy()
+    middle = pos.columns // 2
+    replies = sorted(pos.valid_moves(), key=lambda c: abs(c - middle))
+    budget_ms = TIME_BUDGETS_MS[difficulty]
+    for _ in range(passes):
+        pending = list(replies)
+        while pending:
+            if stop.is_set():
+                return
+            col = preferred() if preferred is not None else None
+            if col not in pending:
+                col = pending[0]
+            pending.remove(col)
+            # Gewinnt der Gegner mit dem Zug, gibt es nichts zu antworten
+            if pos.is_winning_move(col):
+                continue
+            pos.play(col)
+            if not pos.is_full():
+                reply = search_best_move(pos, difficulty, table, stop, parallel, book,
+                                         budget_ms, solver_cells=solver_cells)
+                if reply is not None and not stop.is_set():
+                    results[pos.hash] = reply
+            pos.undo()
+        budget_ms *= 2
+
+
+# -----------------------------------------------------------------------------
+# Wurzel-parallele Suche mit mehreren Prozessen
+# -----------------------------------------------------------------------------
+# Diese Variablen existieren nur in den Worker-Prozessen (siehe _init_worker).
+_worker_alpha = None   # Gemeinsames Alpha aller Worker (multiprocessing.Value)
+_worker_stop = None    # Abbruchsignal (multiprocessing.Event)
+_worker_table = None   # Eigene Transpositionstabelle je Prozess
+
+
+def _init_worker(shared_alpha, stop_event):
+    """Initialisiert einen Worker-Prozess des Pools."""
+    global _worker_alpha, _worker_stop, _worker_table
+    _worker_alpha = shared_alpha
+    _worker_stop = stop_event
+    _worker_table = TranspositionTable()
+
+
+def _warm_up_worker():
+    """Leere Aufgabe, damit der Pool seine Prozesse schon vor dem ersten Zug startet."""
+    return True
+
+
+def _search_root_move(pos, col, depth, difficulty, wall_deadline, pv):
+    """
+    Durchsucht im Worker einen einzelnen Zug der Wurzel. Vor jeder Antwort
+    des Gegners wird das gemeinsame Alpha neu gelesen, damit Züge, die
+    schlechter als der beste bisher gefundene sind, früh abgeschnitten werden.
+    Gibt (Spalte, Wert, Hauptvariante, exakt) zurück. exakt ist False, wenn
+    der Zug am gemeinsamen Alpha gescheitert ist: Der Wert ist dann nur eine
+    obere Schranke, der Zug ist höchstens so gut wie der beste andere.
+    """
+    deadline = time.perf_counter() + (wall_deadline - time.time())
+    ai_piece = pos.current_piece
+    opponent = 1 if ai_piece == 2 else 2
+    if pos.is_winning_move(col, ai_piece):
+        return col, WIN_SCORE + depth, [col], True
+
+    pos.play(col)
+    replies = pos.valid_moves()
+    if not replies:
+        return col, evaluate_position(pos, ai_piece, difficulty), [col], True
+
+    middle = pos.columns // 2
+    replies.sort(key=lambda x: abs(x - middle))
+    child_pv = pv[1:] if pv and pv[0] == col else None
+    if child_pv and child_pv[0] in replies:
+        replies.remove(child_pv[0])
+        replies.insert(0, child_pv[0])
+
+    value = math.inf
+    best_reply = replies[0]
+    alpha = -math.inf
+    for reply in replies:
+        alpha = _worker_alpha.value
+        if value <= alpha:
+            break
+        if pos.is_winning_move(reply, opponent):
+            new_score = -WIN_SCORE - (depth - 2)
+        else:
+            reply_pv = child_pv[1:] if child_pv and child_pv[0] == reply else None
+            pos.play(reply)
+            new_score = minimax(pos, depth - 2, alpha, value, True, difficulty,
+                                _worker_table, deadline, reply_pv, _worker_stop,
+                                ai_piece)[1]
+            pos.undo()
+        if new_score < value:
+            value = new_score
+            best_reply = reply
+
+    # Alpha steigt nur, darum ist der Wert genau dann exakt, wenn er über
+    # dem zuletzt gelesenen (größten verwendeten) Alpha liegt
+    exact = value > alpha
+    if exact:
+        with _worker_alpha.get_lock():
+            if value > _worker_alpha.value:
+                _worker_alpha.value = value
+
+    pos.play(best_reply)
+    return col, value, [col, best_reply] + read_line(pos, _worker_table, depth - 2), exact
+
+
+class ParallelSearch:
+    """
+    Verteilt die Züge an der Wurzel auf einen ProcessPoolExecutor. Alle
+    Worker teilen sich über Shared Memory den besten bisher gefundenen Wert
+    (Alpha), sodass ein Worker aufhören kann, sobald sein Zug nicht mehr
+    besser werden kann. Die Prozesse werden mit warm_up() vorab gestartet.
+    """
+
+    def __init__(self, workers):
+        # "spawn" statt "fork": der Hauptprozess hat bereits Threads und pygame geladen
+        context = multiprocessing.get_context("spawn")
+        self.workers = workers
+        self.shared_alpha = context.Value("d", -math.inf)
+        self.stop_event = context.Event()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.shared_alpha, self.stop_event))
+
+    def warm_up(self):
+        """Startet alle Worker-Prozesse im Voraus, ohne darauf zu warten."""
+        for _ in range(self.workers):
+            self.executor.submit(_warm_up_worker)
+
+    def search(self, pos, depth, difficulty, wall_deadline, pv=None, stop=None):
+        """
+        Eine Iteration der Suche mit fester Tiefe. Gibt (Spalte, Wert,
+        Hauptvariante) zurück oder löst SearchTimeout aus, wenn die Zeit
+        abgelaufen ist oder stop gesetzt wurde.
+        """
+        moves = pos.valid_moves()
+        middle = pos.columns // 2
+        moves.sort(key=lambda x: abs(x - middle))
+        if pv and pv[0] in moves:
+            moves.remove(pv[0])
+            moves.insert(0, pv[0])
+
+        self.shared_alpha.value = -math.inf
+        self.stop_event.clear()
+        futures = [self.executor.submit(_search_root_move, pos.copy(), col, depth,
+                                        difficulty, wall_deadline, pv)
+                   for col in moves]
+
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.01)
+            if stop is not None and stop.is_set():
+                self.stop_event.set()
+        # Erst auswerten, wenn alle fertig sind – sonst liefe ein Worker in die nächste Iteration.
+        # Nur exakte Werte zählen: Ein abgeschnittener Zug kann denselben Wert als
+        # Schranke melden wie der beste Zug, ist aber womöglich schlechter.
+        best = None
+        for future in futures:
+            col, value, line, exact = future.result()  # SearchTimeout wird hier weitergereicht
+            if exact and (best is None or value > best[1]):
+                best = (col, value, line)
+        if best is None:
+            return None, 0, None
+        return best
+
+    def shutdown(self):
+        """Bricht laufende Suchen ab und beendet die Worker-Prozesse."""
+        self.stop_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)